@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
+import asyncio
+import hashlib
+import time
 import bcrypt
 
 # Monkey patch bcrypt to fix compatibility issue
@@ -10,11 +14,15 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 
 from app.admin.models import AdminUser
 from app.admin.schemas import TokenData
+from app.cache import DataVersions, ResponseCache
+from app.config import Config
 from app.db import get_session
 
 # Configuration - should be in environment variables in production
@@ -29,6 +37,13 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 scheme for token extraction from request
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="admin/login")
 
+# Verified token -> username and username -> active AdminUser
+auth_cache = ResponseCache(
+    max_size=Config.AUTH_CACHE_MAX_SIZE,
+    ttl=Config.AUTH_CACHE_TTL,
+    versions=DataVersions(),
+)
+
 
 def verify_password(plain_password, hashed_password):
     """Verify password against hashed version"""
@@ -40,6 +55,27 @@ def get_password_hash(password):
     return pwd_context.hash(password)
 
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event
+# loop while capping how many hashes run at once
+_password_executor = ThreadPoolExecutor(
+    max_workers=Config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    """Verify a password in the hashing pool instead of on the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password):
+    """Hash a password in the hashing pool instead of on the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
 def create_token(
     data: dict, expires_delta: Optional[timedelta] = None, is_refresh: bool = False
 ):
@@ -65,7 +101,7 @@ async def authenticate_admin(username: str, password: str, session: AsyncSession
     result = await session.exec(statement)
     user = result.first()
 
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         return None
 
     return user
@@ -81,29 +117,86 @@ async def get_current_admin(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        is_refresh: bool = payload.get("is_refresh", False)
-
-        if username is None:
+    token_key = ("token", hashlib.sha256(token.encode()).hexdigest())
+    username = auth_cache.get(token_key)
+
+    if username is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            username: str = payload.get("sub")
+            is_refresh: bool = payload.get("is_refresh", False)
+
+            if username is None:
+                raise credentials_exception
+            if is_refresh:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Refresh token used for authentication",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+
+            token_data = TokenData(username=username)
+        except JWTError:
             raise credentials_exception
-        if is_refresh:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Refresh token used for authentication",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
 
-    statement = select(AdminUser).where(AdminUser.username == token_data.username)
-    result = await session.exec(statement)
-    user = result.first()
+        # Never keep a token cached past its own expiry
+        auth_cache.set(token_key, token_data.username, ttl=payload["exp"] - time.time())
+
+    user_key = ("admin", username)
+    user = auth_cache.get(user_key)
+
+    if user is None:
+        statement = select(AdminUser).where(AdminUser.username == username)
+        result = await session.exec(statement)
+        user = result.first()
+
+        if user is not None and user.is_active:
+            auth_cache.set(user_key, user)
 
     if user is None or not user.is_active:
         raise credentials_exception
 
     return user
+
+
+# Called with the username after a committed admin change; the factory adds
+# the publisher that tells the other workers
+admin_invalidation_listeners: list[Callable[[str], None]] = []
+
+
+def invalidate_admin_local(username: str | None):
+    """Drop this worker's cached principal for the admin, or for every admin"""
+    if username is None:
+        auth_cache.invalidate("admin")
+    else:
+        auth_cache.delete(("admin", username))
+
+
+def invalidate_admin(username: str):
+    """Drop a cached admin principal after the admin is changed or deactivated"""
+    invalidate_admin_local(username)
+
+    for listener in admin_invalidation_listeners:
+        listener(username)
+
+
+# Any update or delete of an admin row drops its cached principal, once the
+# change has committed so no request caches the old row again meanwhile
+@event.listens_for(AdminUser, "after_update")
+@event.listens_for(AdminUser, "after_delete")
+def _record_admin_change(mapper, connection, target: AdminUser):
+    changed = object_session(target).info.setdefault("changed_admins", set())
+    changed.add(target.username)
+    # A renamed admin is cached under its old username
+    changed.update(inspect(target).attrs.username.history.deleted)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_admins(session: Session):
+    for username in session.info.pop("changed_admins", ()):
+        invalidate_admin(username)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_admins(session: Session):
+    session.info.pop("changed_admins", None)
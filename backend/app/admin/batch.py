@@ -0,0 +1,168 @@
+import uuid
+from typing import Iterable
+
+from sqlalchemy import delete, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import News, Paper, Publications
+from app.admin.schemas import BatchResult, NewsBatchUpdate, PaperBatchUpdate
+from app.admin.utils import parse_count, parse_date
+
+PUBLICATION_FIELDS = {"title", "link", "types", "pub_date", "pub_date_str"}
+PAPER_FIELDS = {"abstract", "citation_count", "read_count", "authors"}
+
+
+async def _existing_ids(model, ids: Iterable[uuid.UUID], session: AsyncSession):
+    result = await session.exec(select(model.id).where(model.id.in_(list(ids))))
+    return set(result.all())
+
+
+def _unique(ids: Iterable[uuid.UUID], results: dict[int, BatchResult]):
+    """Map each id to its first position, marking repeats as duplicates"""
+    positions = {}
+    for position, item_id in enumerate(ids):
+        if item_id in positions:
+            results[position] = BatchResult(
+                id=item_id, status="duplicate", error="Id repeated in batch"
+            )
+        else:
+            positions[item_id] = position
+    return positions
+
+
+def _ordered(results: dict[int, BatchResult]) -> list[BatchResult]:
+    return [results[position] for position in sorted(results)]
+
+
+async def update_papers(
+    items: list[PaperBatchUpdate], session: AsyncSession
+) -> list[BatchResult]:
+    """
+    Apply paper patches with one bulk UPDATE per table.
+
+    Nothing is committed here, the caller commits the whole batch.
+    """
+    results: dict[int, BatchResult] = {}
+    positions = _unique((item.id for item in items), results)
+    found = await _existing_ids(Paper, positions, session)
+
+    pub_rows, paper_rows = [], []
+    for item_id, position in positions.items():
+        if item_id not in found:
+            results[position] = BatchResult(id=item_id, status="not_found")
+            continue
+
+        update_data = items[position].model_dump(exclude_unset=True, exclude={"id"})
+        pub_date = update_data.pop("pub_date", None)
+        if pub_date:
+            try:
+                update_data["pub_date"] = parse_date(pub_date)
+            except ValueError as e:
+                results[position] = BatchResult(
+                    id=item_id, status="invalid", error=str(e)
+                )
+                continue
+            update_data["pub_date_str"] = pub_date
+
+        pub_values = {k: v for k, v in update_data.items() if k in PUBLICATION_FIELDS}
+        paper_values = {k: v for k, v in update_data.items() if k in PAPER_FIELDS}
+        # Bulk statements skip the ORM flush events, so parse counts here
+        if "citation_count" in paper_values:
+            paper_values["citation_count_num"] = parse_count(
+                paper_values["citation_count"]
+            )
+        if "read_count" in paper_values:
+            paper_values["read_count_num"] = parse_count(paper_values["read_count"])
+
+        if pub_values:
+            pub_rows.append({**pub_values, "id": item_id})
+        if paper_values:
+            paper_rows.append({**paper_values, "id": item_id})
+        results[position] = BatchResult(id=item_id, status="updated")
+
+    if pub_rows:
+        await session.exec(update(Publications), params=pub_rows)
+    if paper_rows:
+        await session.exec(update(Paper), params=paper_rows)
+    return _ordered(results)
+
+
+async def delete_papers(
+    ids: list[uuid.UUID], session: AsyncSession
+) -> list[BatchResult]:
+    """
+    Delete papers and their publications with one DELETE per table.
+
+    Nothing is committed here, the caller commits the whole batch.
+    """
+    results: dict[int, BatchResult] = {}
+    positions = _unique(ids, results)
+    found = await _existing_ids(Paper, positions, session)
+
+    for item_id, position in positions.items():
+        status = "deleted" if item_id in found else "not_found"
+        results[position] = BatchResult(id=item_id, status=status)
+
+    if found:
+        await session.exec(delete(Paper).where(Paper.id.in_(found)))
+        await session.exec(delete(Publications).where(Publications.id.in_(found)))
+    return _ordered(results)
+
+
+async def update_news(
+    items: list[NewsBatchUpdate], session: AsyncSession
+) -> list[BatchResult]:
+    """
+    Apply news patches with one bulk UPDATE.
+
+    Nothing is committed here, the caller commits the whole batch.
+    """
+    results: dict[int, BatchResult] = {}
+    positions = _unique((item.id for item in items), results)
+    found = await _existing_ids(News, positions, session)
+
+    rows = []
+    for item_id, position in positions.items():
+        if item_id not in found:
+            results[position] = BatchResult(id=item_id, status="not_found")
+            continue
+
+        update_data = items[position].model_dump(exclude_unset=True, exclude={"id"})
+        if "publish_date" in update_data:
+            publish_date = update_data["publish_date"]
+            try:
+                update_data["publish_date"] = parse_date(publish_date)
+            except ValueError as e:
+                results[position] = BatchResult(
+                    id=item_id, status="invalid", error=str(e)
+                )
+                continue
+            update_data["publish_date_str"] = publish_date
+
+        if update_data:
+            rows.append({**update_data, "id": item_id})
+        results[position] = BatchResult(id=item_id, status="updated")
+
+    if rows:
+        await session.exec(update(News), params=rows)
+    return _ordered(results)
+
+
+async def delete_news(ids: list[uuid.UUID], session: AsyncSession) -> list[BatchResult]:
+    """
+    Delete news items with one DELETE.
+
+    Nothing is committed here, the caller commits the whole batch.
+    """
+    results: dict[int, BatchResult] = {}
+    positions = _unique(ids, results)
+    found = await _existing_ids(News, positions, session)
+
+    for item_id, position in positions.items():
+        status = "deleted" if item_id in found else "not_found"
+        results[position] = BatchResult(id=item_id, status=status)
+
+    if found:
+        await session.exec(delete(News).where(News.id.in_(found)))
+    return _ordered(results)
@@ -0,0 +1,247 @@
+import logging
+import json
+from typing import AsyncIterator
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import News, Paper, Publications
+from app.admin.references import store_references
+from app.admin.schemas import NewsCreate, PaperCreate
+from app.admin.schemas import Publications as PublicationCreate
+from app.admin.utils import parse_count, parse_dates
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+IMPORT_SCHEMAS: dict[str, type[BaseModel]] = {
+    "publications": PublicationCreate,
+    "papers": PaperCreate,
+    "news": NewsCreate,
+}
+
+# Reported per-line errors are capped, the total count is not
+MAX_REPORTED_ERRORS = 1000
+
+
+async def iter_lines(
+    stream: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes | None]:
+    """
+    Split a byte stream into lines without holding more than one line.
+
+    Yields None in place of a line longer than max_line_bytes.
+    """
+    buffer = b""
+    skipping = False
+
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+                yield None
+            else:
+                yield line if len(line) <= max_line_bytes else None
+
+        if len(buffer) > max_line_bytes:
+            buffer = b""
+            skipping = True
+
+    if skipping:
+        yield None
+    elif buffer:
+        yield buffer
+
+
+async def _write_publications(
+    records: list[PublicationCreate], session: AsyncSession
+) -> tuple[int, int]:
+    by_link = {record.link: record for record in records}
+
+    result = await session.exec(
+        select(Publications.link, Publications.id).where(Publications.link.in_(by_link))
+    )
+    existing = dict(result.all())
+
+    inserts, updates = [], []
+    for record in by_link.values():
+        values = record.model_dump()
+        if record.link in existing:
+            updates.append({**values, "id": existing[record.link]})
+        else:
+            inserts.append(Publications(**values).model_dump())
+
+    if inserts:
+        await session.exec(insert(Publications), params=inserts)
+    if updates:
+        await session.exec(update(Publications), params=updates)
+    return len(inserts), len(updates)
+
+
+async def _write_papers(
+    records: list[PaperCreate], session: AsyncSession
+) -> tuple[int, int]:
+    by_link = {record.link: record for record in records}
+    pub_dates = parse_dates(record.pub_date for record in by_link.values())
+
+    result = await session.exec(
+        select(Publications.link, Publications.id, Paper.id)
+        .join(Paper, Paper.id == Publications.id, isouter=True)
+        .where(Publications.link.in_(by_link))
+    )
+    existing = {link: (pub_id, paper_id) for link, pub_id, paper_id in result.all()}
+
+    pub_inserts, pub_updates, paper_inserts, paper_updates = [], [], [], []
+    references = {}
+    for record, pub_date in zip(by_link.values(), pub_dates):
+        pub_values = {
+            "title": record.title,
+            "link": record.link,
+            "pub_date": pub_date,
+            "pub_date_str": record.pub_date,
+        }
+        paper_values = record.model_dump(
+            include={"abstract", "citation_count", "read_count", "authors"}
+        )
+        # Bulk statements skip the ORM flush events, so parse counts here
+        paper_values["citation_count_num"] = parse_count(record.citation_count)
+        paper_values["read_count_num"] = parse_count(record.read_count)
+
+        pub_id, paper_id = existing.get(record.link, (None, None))
+        if pub_id is None:
+            publication = Publications(types=record.types or ["paper"], **pub_values)
+            pub_inserts.append(publication.model_dump())
+            pub_id = publication.id
+        else:
+            if record.types is not None:
+                pub_values["types"] = record.types
+            pub_updates.append({**pub_values, "id": pub_id})
+
+        new_paper = paper_id is None
+        if new_paper:
+            paper_id = pub_id
+        # A line without "references" keeps those of an existing paper
+        if new_paper or "references" in record.model_fields_set:
+            paper_values["reference_count"] = len(record.references or [])
+            references[paper_id] = record.references or []
+
+        if new_paper:
+            paper_inserts.append({**paper_values, "id": paper_id})
+        else:
+            paper_updates.append({**paper_values, "id": paper_id})
+
+    if pub_inserts:
+        await session.exec(insert(Publications), params=pub_inserts)
+    if pub_updates:
+        await session.exec(update(Publications), params=pub_updates)
+    if paper_inserts:
+        await session.exec(insert(Paper), params=paper_inserts)
+    if paper_updates:
+        await session.exec(update(Paper), params=paper_updates)
+    await store_references(session, references)
+    return len(paper_inserts), len(paper_updates)
+
+
+async def _write_news(
+    records: list[NewsCreate], session: AsyncSession
+) -> tuple[int, int]:
+    publish_dates = parse_dates(record.publish_date for record in records)
+
+    inserts = []
+    for record, publish_date in zip(records, publish_dates):
+        values = record.model_dump()
+        values["publish_date"] = publish_date
+        values["publish_date_str"] = record.publish_date
+        inserts.append(News(**values).model_dump())
+
+    await session.exec(insert(News), params=inserts)
+    return len(inserts), 0
+
+
+WRITERS = {
+    "publications": _write_publications,
+    "papers": _write_papers,
+    "news": _write_news,
+}
+
+
+async def import_ndjson(
+    kind: str, stream: AsyncIterator[bytes], session: AsyncSession
+) -> dict:
+    """
+    Import NDJSON records of one kind in bounded chunks.
+
+    Each line is validated against the kind's create schema. Valid records
+    are written with one bulk statement per operation and committed every
+    IMPORT_CHUNK_SIZE records, so memory stays constant however long the
+    body is. Invalid lines and failed chunks are reported per line and the
+    rest of the import carries on. Papers are matched by link; an update
+    only replaces the references when its line has a "references" key.
+    """
+    schema = IMPORT_SCHEMAS[kind]
+    writer = WRITERS[kind]
+    report = {"processed": 0, "inserted": 0, "updated": 0, "error_count": 0}
+    errors = []
+
+    def add_error(line_no: int, error: str):
+        report["error_count"] += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"line": line_no, "error": error})
+
+    async def flush(chunk: list[tuple[int, BaseModel]]):
+        try:
+            inserted, updated = await writer([record for _, record in chunk], session)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.exception("Error importing %s chunk", kind)
+            for line_no, _ in chunk:
+                add_error(line_no, f"Chunk failed: {e.__class__.__name__}")
+            return
+        report["inserted"] += inserted
+        report["updated"] += updated
+
+    chunk = []
+    line_no = 0
+    async for line in iter_lines(stream, Config.IMPORT_MAX_LINE_BYTES):
+        line_no += 1
+        if line is None:
+            add_error(line_no, "Line too long")
+            continue
+        if not line.strip():
+            continue
+
+        report["processed"] += 1
+        try:
+            record = schema.model_validate(json.loads(line))
+            if kind == "papers":
+                parse_dates([record.pub_date])
+            elif kind == "news":
+                parse_dates([record.publish_date])
+        except ValidationError as e:
+            add_error(
+                line_no,
+                "; ".join(
+                    f"{'.'.join(map(str, err['loc'])) or 'record'}: {err['msg']}"
+                    for err in e.errors(include_url=False)
+                ),
+            )
+            continue
+        except ValueError as e:
+            add_error(line_no, str(e))
+            continue
+
+        chunk.append((line_no, record))
+        if len(chunk) >= Config.IMPORT_CHUNK_SIZE:
+            await flush(chunk)
+            chunk = []
+
+    if chunk:
+        await flush(chunk)
+
+    report["errors"] = errors
+    return report
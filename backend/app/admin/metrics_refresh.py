@@ -0,0 +1,206 @@
+import asyncio
+import heapq
+import logging
+import math
+import random
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, or_, text, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import Paper, Profile, Publications
+from app.admin.services import Services
+from app.admin.statistics import refresh_statistics
+from app.cache import PROFILE, PUBLICATIONS, STATISTICS, invalidate
+from app.config import Config
+from app.db import async_session, engine
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_lock key, any constant shared by all workers will do
+REFRESH_LOCK_KEY = 0x50A9E047
+
+# Stalest rows read from the database before ranking them by views
+CANDIDATE_FACTOR = 10
+
+# Paper views seen by this worker since the last flush
+paper_views: Counter[uuid.UUID] = Counter()
+
+# Papers counted between flushes; views of further papers are dropped
+MAX_PENDING_VIEWS = 10000
+
+# Sent by internal readers such as the static export, whose fetches are
+# not views
+SKIP_VIEW_HEADER = "X-Skip-View-Count"
+
+
+def record_view(paper_id: uuid.UUID):
+    """Count a view of an existing paper, for the refresh task to flush"""
+    if not Config.METRICS_REFRESH_ENABLED:
+        return
+    if paper_id in paper_views or len(paper_views) < MAX_PENDING_VIEWS:
+        paper_views[paper_id] += 1
+
+
+async def flush_views(session: AsyncSession):
+    """Add this worker's view counts to the papers, one UPDATE per count"""
+    if not paper_views:
+        return
+    views = dict(paper_views)
+    paper_views.clear()
+
+    by_count: dict[int, list[uuid.UUID]] = {}
+    for paper_id, count in views.items():
+        by_count.setdefault(count, []).append(paper_id)
+    for count, paper_ids in by_count.items():
+        await session.exec(
+            update(Paper)
+            .where(Paper.id.in_(paper_ids))
+            .values(view_count=func.coalesce(Paper.view_count, 0) + count)
+        )
+    await session.commit()
+
+
+def priority(updated_at: datetime | None, views: int | None, now: datetime):
+    """Heap key: the oldest and most viewed papers sort first"""
+    age = (now - updated_at).total_seconds() if updated_at else math.inf
+    return -age * (1 + math.log1p(views or 0)), -(views or 0)
+
+
+async def due_papers(session: AsyncSession, now: datetime, limit: int):
+    cutoff = now - timedelta(seconds=Config.METRICS_REFRESH_MIN_AGE)
+    result = await session.exec(
+        select(Paper.id, Publications.link, Paper.metrics_updated_at, Paper.view_count)
+        .join(Publications, Paper.id == Publications.id)
+        .where(
+            or_(Paper.metrics_updated_at.is_(None), Paper.metrics_updated_at < cutoff)
+        )
+        .order_by(Paper.metrics_updated_at.asc().nulls_first())
+        .limit(limit * CANDIDATE_FACTOR)
+    )
+    queue = [
+        (priority(updated_at, views, now), paper_id, link)
+        for paper_id, link, updated_at, views in result.all()
+    ]
+    return [(paper_id, link) for _, paper_id, link in heapq.nsmallest(limit, queue)]
+
+
+async def profile_due(session: AsyncSession, now: datetime) -> bool:
+    cutoff = now - timedelta(seconds=Config.METRICS_REFRESH_MIN_AGE)
+    result = await session.exec(
+        select(Profile.id).where(
+            or_(
+                Profile.metrics_updated_at.is_(None),
+                Profile.metrics_updated_at < cutoff,
+            )
+        )
+    )
+    return result.first() is not None
+
+
+async def refresh_metrics_once(services: Services) -> dict:
+    """
+    Re-fetch the metrics of the profile and the most overdue papers.
+
+    The crawl runs with no transaction open; results are written in one
+    short transaction afterwards. Papers whose page could not be read are
+    still stamped, so a broken link moves to the back of the queue.
+    """
+    now = datetime.utcnow()
+    async with async_session() as session:
+        refresh_profile = await profile_due(session, now)
+        papers = await due_papers(session, now, Config.METRICS_REFRESH_BATCH)
+    if not refresh_profile and not papers:
+        return {"profile": False, "papers": 0, "failed": 0}
+
+    profile_values, paper_values = await services.get_metrics(
+        refresh_profile, [link for _, link in papers]
+    )
+
+    async with async_session() as session:
+        if refresh_profile:
+            for profile in (await session.exec(select(Profile))).all():
+                profile.sqlmodel_update(
+                    {k: v for k, v in (profile_values or {}).items() if v}
+                )
+                profile.metrics_updated_at = now
+                session.add(profile)
+
+        links = dict(papers)
+        result = await session.exec(select(Paper).where(Paper.id.in_(links)))
+        for paper in result.all():
+            values = paper_values.get(links[paper.id]) or {}
+            paper.sqlmodel_update({k: v for k, v in values.items() if v})
+            paper.metrics_updated_at = now
+            session.add(paper)
+
+        await refresh_statistics(session)
+        await session.commit()
+
+    invalidate(PUBLICATIONS, STATISTICS, *([PROFILE] if refresh_profile else []))
+    return {
+        "profile": refresh_profile,
+        "papers": len(papers),
+        "failed": len(papers) - len(paper_values),
+    }
+
+
+@asynccontextmanager
+async def refresh_lock():
+    """
+    Yield whether this worker may run the refresh.
+
+    On Postgres a session-level advisory lock makes sure only one worker
+    crawls at a time; other databases are assumed to have a single worker.
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    async with engine.connect() as conn:
+        acquired = await conn.scalar(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": REFRESH_LOCK_KEY}
+        )
+        # The lock belongs to the session, so don't sit idle in a transaction
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": REFRESH_LOCK_KEY}
+                )
+                await conn.commit()
+
+
+async def run_metrics_refresh(crawl: bool = True):
+    """
+    Flush view counts and refresh overdue metrics every jittered interval.
+
+    Runs for the lifetime of the application. Workers without the admin
+    routes pass crawl=False and only flush the views they recorded.
+    """
+    services = Services()
+    while True:
+        jitter = Config.METRICS_REFRESH_JITTER
+        await asyncio.sleep(
+            Config.METRICS_REFRESH_INTERVAL * random.uniform(1 - jitter, 1 + jitter)
+        )
+        try:
+            async with async_session() as session:
+                await flush_views(session)
+            if not crawl:
+                continue
+
+            async with refresh_lock() as acquired:
+                if acquired:
+                    report = await refresh_metrics_once(services)
+                    logger.info("Metrics refreshed: %s", report)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error refreshing metrics")
@@ -1,11 +1,13 @@
 from typing import Optional
-from sqlmodel import Field, SQLModel, Column
+from sqlmodel import Field, SQLModel, Column, Relationship
 from pydantic import EmailStr
 from sqlalchemy.dialects.postgresql import JSON
 from datetime import date, datetime
-from sqlalchemy import Date
+from sqlalchemy import Date, Index, event
 import uuid
 
+from app.admin.utils import parse_count
+
 
 class Publications(SQLModel, table=True):
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
@@ -15,6 +17,15 @@ class Publications(SQLModel, table=True):
     pub_date: date = Field(sa_type=Date)
     pub_date_str: str
 
+    paper: Optional["Paper"] = Relationship(
+        back_populates="publication",
+        sa_relationship_kwargs={
+            "uselist": False,
+            "cascade": "all, delete-orphan",
+            "passive_deletes": True,
+        },
+    )
+
 
 class Profile(SQLModel, table=True):
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
@@ -23,6 +34,10 @@ class Profile(SQLModel, table=True):
     total_pub: str
     reads: str
     total_citations: str
+    total_pub_num: int | None = None
+    reads_num: int | None = None
+    total_citations_num: int | None = None
+    metrics_updated_at: datetime | None = None
     institution: str
     department: str
     address: str
@@ -33,15 +48,58 @@ class Profile(SQLModel, table=True):
 
 
 class Paper(SQLModel, table=True):
-    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
-    title: str
+    # A paper holds the detail fields of a publication; title, link and dates
+    # live on the publication row it shares its primary key with.
+    id: uuid.UUID = Field(
+        primary_key=True, foreign_key="publications.id", ondelete="CASCADE"
+    )
     abstract: str | None = None
-    link: str
     citation_count: str | None = None
     read_count: str | None = None
-    pub_date: str
+    citation_count_num: int | None = Field(default=None, index=True)
+    read_count_num: int | None = Field(default=None, index=True)
     authors: list[str] = Field(sa_column=Column(JSON, default=list, nullable=False))
-    references: list[dict] = Field(sa_column=Column(JSON, default=list, nullable=True))
+    # The references themselves are rows of the shared Reference table
+    reference_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    # Bookkeeping for the periodic metrics refresh
+    metrics_updated_at: datetime | None = Field(default=None, index=True)
+    view_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+    publication: Publications = Relationship(back_populates="paper")
+
+
+class Reference(SQLModel, table=True):
+    # A cited work, stored once however many papers cite it
+    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    key: str = Field(unique=True, index=True)  # see app.admin.references
+    title: str
+    link: str
+    authors: list[str] = Field(sa_column=Column(JSON, default=list, nullable=False))
+
+
+class PaperReference(SQLModel, table=True):
+    paper_id: uuid.UUID = Field(
+        primary_key=True, foreign_key="paper.id", ondelete="CASCADE"
+    )
+    position: int = Field(primary_key=True)
+    reference_id: uuid.UUID = Field(foreign_key="reference.id", index=True)
+
+
+# The scraped metrics are kept for display; their parsed values are refreshed
+# on every flush so the database can sort and sum them.
+@event.listens_for(Profile, "before_insert")
+@event.listens_for(Profile, "before_update")
+def set_profile_metrics(mapper, connection, target: Profile):
+    target.total_pub_num = parse_count(target.total_pub)
+    target.reads_num = parse_count(target.reads)
+    target.total_citations_num = parse_count(target.total_citations)
+
+
+@event.listens_for(Paper, "before_insert")
+@event.listens_for(Paper, "before_update")
+def set_paper_metrics(mapper, connection, target: Paper):
+    target.citation_count_num = parse_count(target.citation_count)
+    target.read_count_num = parse_count(target.read_count)
 
 
 class AdminUser(SQLModel, table=True):
@@ -53,6 +111,11 @@ class AdminUser(SQLModel, table=True):
 
 
 class News(SQLModel, table=True):
+    # Serves the filtered /user/news lists, e.g. the featured ticker
+    __table_args__ = (
+        Index("ix_news_featured_type_date", "is_featured", "news_type", "publish_date"),
+    )
+
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     title: str
     content: str
@@ -62,3 +125,10 @@ class News(SQLModel, table=True):
     news_type: str  # e.g., "upcoming_paper", "project", "event", "announcement"
     is_featured: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Statistic(SQLModel, table=True):
+    # Precomputed summary rows, e.g. ("publications_by_year", "2024", 12)
+    category: str = Field(primary_key=True)
+    key: str = Field(primary_key=True)
+    value: int = 0
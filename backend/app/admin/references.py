@@ -0,0 +1,167 @@
+import hashlib
+import logging
+import uuid
+from typing import Iterator
+from urllib.parse import urlsplit
+
+from pydantic import ValidationError
+from sqlalchemy import MetaData, Table, delete, inspect, insert, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import Paper, PaperReference, Reference
+from app.admin.schemas import Reference as ReferenceCreate
+
+logger = logging.getLogger(__name__)
+
+# Keys per IN (...) clause and rows per bulk insert
+CHUNK_SIZE = 1000
+
+# Default page of /user/paper/{id}/references, also used by the static export
+REFERENCES_PAGE_SIZE = 20
+
+
+def _chunks(items: list) -> Iterator[list]:
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield items[start : start + CHUNK_SIZE]
+
+
+def normalize_link(link: str) -> str:
+    """Drop the scheme, "www.", the fragment and trailing slashes of a link"""
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    path = parts.path.rstrip("/")
+    return f"{host}{path}?{parts.query}" if parts.query else f"{host}{path}"
+
+
+def reference_key(reference: ReferenceCreate) -> str:
+    """
+    Identity of a cited work: its normalized link, or its title when the
+    scraper found no link. Hashed to keep the unique index narrow.
+    """
+    if reference.link.strip():
+        basis = "link:" + normalize_link(reference.link)
+    else:
+        basis = "title:" + " ".join(reference.title.lower().split())
+    return hashlib.sha256(basis.encode()).hexdigest()
+
+
+async def store_references(
+    session: AsyncSession, references: dict[uuid.UUID, list[ReferenceCreate]]
+):
+    """
+    Replace the reference lists of the given papers.
+
+    Works already in the Reference table are linked rather than copied, so
+    a reference cited by many papers is stored once. The papers must exist;
+    their reference_count is for the caller to set.
+    """
+    keyed = {
+        paper_id: [reference_key(reference) for reference in paper_references]
+        for paper_id, paper_references in references.items()
+    }
+    works = {
+        key: reference
+        for paper_id, keys in keyed.items()
+        for key, reference in zip(keys, references[paper_id])
+    }
+
+    ids: dict[str, uuid.UUID] = {}
+    for keys in _chunks(list(works)):
+        result = await session.exec(
+            select(Reference.key, Reference.id).where(Reference.key.in_(keys))
+        )
+        ids.update(result.all())
+
+    new_works = []
+    for key, reference in works.items():
+        if key not in ids:
+            ids[key] = uuid.uuid4()
+            new_works.append({"id": ids[key], "key": key, **reference.model_dump()})
+    for rows in _chunks(new_works):
+        await session.exec(insert(Reference), params=rows)
+
+    for paper_ids in _chunks(list(keyed)):
+        await session.exec(
+            delete(PaperReference).where(PaperReference.paper_id.in_(paper_ids))
+        )
+    links = [
+        {"paper_id": paper_id, "position": position, "reference_id": ids[key]}
+        for paper_id, keys in keyed.items()
+        for position, key in enumerate(keys)
+    ]
+    for rows in _chunks(links):
+        await session.exec(insert(PaperReference), params=rows)
+
+
+async def get_references(
+    session: AsyncSession, paper_id: uuid.UUID, offset: int, limit: int
+) -> list[ReferenceCreate]:
+    """One page of a paper's references, in the order they were scraped"""
+    result = await session.exec(
+        select(Reference)
+        .join(PaperReference, PaperReference.reference_id == Reference.id)
+        .where(PaperReference.paper_id == paper_id)
+        .order_by(PaperReference.position)
+        .offset(offset)
+        .limit(limit)
+    )
+    return [
+        ReferenceCreate(title=row.title, link=row.link, authors=row.authors)
+        for row in result.all()
+    ]
+
+
+async def migrate_inline_references(conn: AsyncConnection):
+    """
+    Move references stored inline on paper rows into the Reference table.
+
+    Databases created before the table existed keep a JSON "references"
+    column on paper, which create_all leaves alone. Its lists are moved over
+    a page of papers at a time, then the column is dropped.
+    """
+    columns = await conn.run_sync(
+        lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns("paper")}
+    )
+    if "references" not in columns:
+        return
+
+    logger.info("Moving inline paper references to the reference table")
+    legacy = await conn.run_sync(
+        lambda sync_conn: Table("paper", MetaData(), autoload_with=sync_conn)
+    )
+
+    session = AsyncSession(bind=conn)
+    moved, last_id = 0, None
+    while True:
+        statement = select(legacy.c.id, legacy.c.references).order_by(legacy.c.id)
+        if last_id is not None:
+            statement = statement.where(legacy.c.id > last_id)
+        rows = (await conn.execute(statement.limit(CHUNK_SIZE))).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        references = {}
+        for paper_id, inline in rows:
+            paper_references = []
+            for reference in inline or []:
+                try:
+                    paper_references.append(ReferenceCreate.model_validate(reference))
+                except ValidationError:
+                    continue
+            references[uuid.UUID(str(paper_id))] = paper_references
+
+        await store_references(session, references)
+        await session.exec(
+            update(Paper),
+            params=[
+                {"id": paper_id, "reference_count": len(paper_references)}
+                for paper_id, paper_references in references.items()
+            ],
+        )
+        moved += len(rows)
+
+    await conn.execute(text('ALTER TABLE paper DROP COLUMN "references"'))
+    logger.info("Moved the references of %d papers", moved)
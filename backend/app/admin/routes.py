@@ -1,5 +1,9 @@
+import logging
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException
+import math
+import uuid
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Request
 from datetime import timedelta
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError, jwt
@@ -10,6 +14,16 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette import status
 from sqlmodel import select
 
+from app.cache import (
+    NEWS,
+    PROFILE,
+    PUBLICATIONS,
+    STATISTICS,
+    invalidate,
+    response_cache,
+)
+from app.config import Config
+from app.media import media_cache
 from app.db import get_session, engine  # Import engine from db.py
 from app.admin.models import Publications, Profile, Paper, AdminUser, News
 from app.admin.schemas import (
@@ -24,23 +38,108 @@ from app.admin.schemas import (
     PaperUpdate,
     NewsCreate,
     NewsUpdate,
+    PaperBatchUpdate,
+    NewsBatchUpdate,
+    BatchDelete,
 )
 from app.admin.auth import (
     SECRET_KEY,
+    auth_cache,
     authenticate_admin,
     get_current_admin,
     create_token,
-    get_password_hash,
+    get_password_hash_async,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     REFRESH_TOKEN_EXPIRE_DAYS,
     ALGORITHM,
 )
-from app.admin.utils import parse_date
+from app.admin import batch
+from app.admin.importer import import_ndjson
+from app.admin.references import store_references
+from app.admin.statistics import refresh_statistics
+from app.admin.throttle import login_throttle
+from app.admin.utils import parse_date, paper_detail
+
+logger = logging.getLogger(__name__)
 
 admin_router = APIRouter()
 services = Services()
 
 
+def check_batch_size(size: int):
+    if size > Config.BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds {Config.BATCH_MAX_SIZE} items",
+        )
+
+
+async def get_paper_with_publication(paper_id: uuid.UUID, session: AsyncSession):
+    """Load a Paper and its Publications row with one joined query"""
+    statement = (
+        select(Paper, Publications)
+        .join(Publications, Paper.id == Publications.id)
+        .where(Paper.id == paper_id)
+    )
+    result = await session.exec(statement)
+    row = result.first()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found"
+        )
+
+    return row
+
+
+async def save_paper(paper_data: PaperCreate, session: AsyncSession):
+    """
+    Store a paper and the publication it belongs to in one transaction.
+
+    An existing publication with the same link is reused, otherwise a new one
+    is created for the paper.
+    """
+    statement = (
+        select(Publications, Paper)
+        .join(Paper, Paper.id == Publications.id, isouter=True)
+        .where(Publications.link == paper_data.link)
+    )
+    result = await session.exec(statement)
+    row = result.first()
+
+    if row and row[1]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Paper already exists"
+        )
+
+    if row:
+        publication = row[0]
+    else:
+        publication = Publications(
+            title=paper_data.title,
+            link=paper_data.link,
+            types=["paper"],
+            pub_date=parse_date(paper_data.pub_date),
+            pub_date_str=paper_data.pub_date,
+        )
+        session.add(publication)
+
+    references = paper_data.references or []
+    paper = Paper(
+        id=publication.id,
+        **paper_data.model_dump(exclude={"references"}),
+        reference_count=len(references),
+    )
+    session.add(paper)
+    await session.flush()
+    await store_references(session, {paper.id: references})
+    await refresh_statistics(session)
+    await session.commit()
+    invalidate(PUBLICATIONS, STATISTICS)
+
+    return paper, publication
+
+
 @admin_router.post("/add_all_research")
 async def list_down_all_publication(
     url: Url | None = None,
@@ -82,12 +181,14 @@ async def list_down_all_publication(
                 new_publications.append(pub)
 
         session.add_all(new_publications)
+        await refresh_statistics(session)
         await session.commit()
+        invalidate(PUBLICATIONS, STATISTICS)
 
         return {"size": len(new_publications), "data": new_publications}
 
-    except Exception as e:
-        print(f"Error listing publications: {e}")
+    except Exception:
+        logger.exception("Error listing publications")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -125,11 +226,12 @@ async def get_profile(
         profile = Profile(**content.model_dump())
         session.add(profile)
         await session.commit()
+        invalidate(PROFILE)
 
         return {"msg": "Profile Added Successfully", "data": profile}
 
-    except Exception as e:
-        print(f"Error getting profile: {e}")
+    except Exception:
+        logger.exception("Error getting profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -170,11 +272,12 @@ async def update_profile(
         profile_db.sqlmodel_update(profile_data)
         session.add(profile_db)
         await session.commit()
+        invalidate(PROFILE)
         await session.refresh(profile_db)
 
         return {"msg": "Profile Update Successfully", "data": profile_db}
-    except Exception as e:
-        print(f"Error updating profile: {e}")
+    except Exception:
+        logger.exception("Error updating profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -210,28 +313,16 @@ async def get_publication_details(
                 status_code=status.HTTP_404_NOT_FOUND, detail="No content found"
             )
 
-        papers = Paper(**content.model_dump())
-        statement = select(Paper).where(Paper.link == papers.link)
-        result = await session.exec(statement)
-        result = result.first()
-
-        statement = select(Publications).where(Publications.link == papers.link)
-        result1 = await session.exec(statement)  # Check if publication exists
-        result1 = result1.first()
-        if result1:
-            papers.id = result1.id
-
-        if not result:
-            session.add(papers)
-            await session.commit()
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Paper already exists"
-            )
+        paper, publication = await save_paper(content, session)
 
-        return {"message": "Paper added successfully", "data": papers}
-    except Exception as e:
-        print(f"Error fetching publication details: {e}")
+        return {
+            "message": "Paper added successfully",
+            "data": paper_detail(paper, publication),
+        }
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching publication details")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -240,22 +331,35 @@ async def get_publication_details(
 
 @admin_router.post("/login", response_model=Token)
 async def login_for_access_token(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Authenticate admin and issue access and refresh tokens
     """
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = login_throttle.check(client_ip)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
     try:
         user = await authenticate_admin(form_data.username, form_data.password, session)
 
         if not user:
+            login_throttle.record_failure(client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        login_throttle.record_success(client_ip)
+
         # Create access token
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_token(
@@ -275,8 +379,10 @@ async def login_for_access_token(
             "refresh_token": refresh_token,
             "token_type": "bearer",
         }
-    except Exception as e:
-        print(f"Error logging in: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error logging in")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -364,7 +470,7 @@ async def register_admin(
         )
 
     # Create new admin user
-    hashed_password = get_password_hash(admin.password)
+    hashed_password = await get_password_hash_async(admin.password)
     db_admin = AdminUser(
         username=admin.username, email=admin.email, hashed_password=hashed_password
     )
@@ -398,16 +504,52 @@ async def add_publications_direct(
                 new_publications.append(pub)
 
         session.add_all(new_publications)
+        await refresh_statistics(session)
         await session.commit()
+        invalidate(PUBLICATIONS, STATISTICS)
 
         return {"size": len(new_publications), "data": new_publications}
 
-    except Exception as e:
-        print(f"Error adding publications: {e}")
+    except Exception:
+        logger.exception("Error adding publications")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@admin_router.post("/import/{kind}")
+async def import_records(
+    kind: Literal["publications", "papers", "news"],
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_admin: AdminUser = Depends(get_current_admin),
+):
+    """
+    Stream-import NDJSON records, one JSON object per line.
+
+    Lines are validated against the publication, paper or news create
+    schema and written in bounded chunks. Invalid lines are reported with
+    their line number without stopping the import.
+    """
+    try:
+        return await import_ndjson(kind, request.stream(), session)
+    except Exception:
+        logger.exception("Error importing %s", kind)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         )
+    finally:
+        # Chunks committed before a failure stay, so they are published too
+        await session.rollback()
+        try:
+            await refresh_statistics(session)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Error refreshing statistics after import")
+        invalidate(NEWS if kind == "news" else PUBLICATIONS, STATISTICS)
 
 
 @admin_router.post("/direct/add_profile")
@@ -423,12 +565,13 @@ async def add_profile_direct(
         profile = Profile(**profile_data.model_dump())
         session.add(profile)
         await session.commit()
+        invalidate(PROFILE)
         await session.refresh(profile)
 
         return {"msg": "Profile Added Successfully", "data": profile}
 
-    except Exception as e:
-        print(f"Error adding profile: {e}")
+    except Exception:
+        logger.exception("Error adding profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -456,11 +599,12 @@ async def update_profile_direct(
         profile_db.sqlmodel_update(profile_data)
         session.add(profile_db)
         await session.commit()
+        invalidate(PROFILE)
         await session.refresh(profile_db)
 
         return {"msg": "Profile Updated Successfully", "data": profile_db}
-    except Exception as e:
-        print(f"Error updating profile: {e}")
+    except Exception:
+        logger.exception("Error updating profile")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -477,37 +621,16 @@ async def add_paper_direct(
     Add paper details directly from JSON payload.
     """
     try:
-        paper = Paper(**paper_data.model_dump())
-
-        statement = select(Paper).where(Paper.link == paper.link)
-        result = await session.exec(statement)
-        result = result.first()
-
-        if result:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Paper already exists"
-            )
+        paper, publication = await save_paper(paper_data, session)
 
-        session.add(paper)
-        await session.commit()
-        await session.refresh(paper)
-
-        publications = Publications(
-            id=paper.id,
-            title=paper.title,
-            link=paper.link,
-            types=["paper"],
-            pub_date=parse_date(paper.pub_date),
-            pub_date_str=paper.pub_date,
-        )
-        session.add(publications)
-        await session.commit()
-
-        return {"message": "Paper added successfully", "data": paper}
+        return {
+            "message": "Paper added successfully",
+            "data": paper_detail(paper, publication),
+        }
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error adding paper details: {e}")
+    except Exception:
+        logger.exception("Error adding paper details")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -516,7 +639,7 @@ async def add_paper_direct(
 
 @admin_router.patch("/update/paper/{paper_id}")
 async def update_paper(
-    paper_id: str,
+    paper_id: uuid.UUID,
     paper_data: PaperUpdate,
     session: AsyncSession = Depends(get_session),
     current_admin: AdminUser = Depends(get_current_admin),
@@ -525,31 +648,30 @@ async def update_paper(
     Update paper details directly from JSON payload.
     """
     try:
-        paper_db = await session.get(Paper, paper_id)
-        pub_db = await session.get(Publications, paper_id)
-        if not paper_db or not pub_db:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found"
-            )
+        paper_db, pub_db = await get_paper_with_publication(paper_id, session)
 
-        pub_data = paper_data.model_dump(exclude_unset=True)
+        update_data = paper_data.model_dump(exclude_unset=True)
         if paper_data.pub_date:
-            pub_data["pub_date"] = parse_date(paper_data.pub_date)
-            pub_data["pub_date_str"] = paper_data.pub_date
-        pub_db.sqlmodel_update(pub_data)
-        session.add(pub_db)
-        await session.commit()
-        await session.refresh(pub_db)
+            update_data["pub_date"] = parse_date(paper_data.pub_date)
+            update_data["pub_date_str"] = paper_data.pub_date
 
-        paper_data = paper_data.model_dump(exclude_unset=True)
-        paper_db.sqlmodel_update(paper_data)
+        # sqlmodel_update only applies the keys that exist on each table
+        pub_db.sqlmodel_update(update_data)
+        paper_db.sqlmodel_update(update_data)
+        session.add(pub_db)
         session.add(paper_db)
+        await refresh_statistics(session)
         await session.commit()
-        await session.refresh(paper_db)
+        invalidate(PUBLICATIONS, STATISTICS)
 
-        return {"msg": "Paper Updated Successfully", "data": paper_db}
-    except Exception as e:
-        print(f"Error updating paper: {e}")
+        return {
+            "msg": "Paper Updated Successfully",
+            "data": paper_detail(paper_db, pub_db),
+        }
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error updating paper")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -558,7 +680,7 @@ async def update_paper(
 
 @admin_router.delete("/delete/paper/{paper_id}")
 async def delete_paper(
-    paper_id: str,
+    paper_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
     current_admin: AdminUser = Depends(get_current_admin),
 ):
@@ -566,26 +688,98 @@ async def delete_paper(
     Delete paper details directly from JSON payload.
     """
     try:
-        paper_db = await session.get(Paper, paper_id)
-        pub_db = await session.get(Publications, paper_id)
-        if not paper_db or not pub_db:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found"
-            )
+        paper_db, pub_db = await get_paper_with_publication(paper_id, session)
+        data = paper_detail(paper_db, pub_db)
 
         await session.delete(paper_db)
         await session.delete(pub_db)
+        await refresh_statistics(session)
+        await session.commit()
+        invalidate(PUBLICATIONS, STATISTICS)
+
+        return {"msg": "Paper Deleted Successfully", "data": data}
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error deleting paper")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@admin_router.patch("/batch/update/papers")
+async def batch_update_papers(
+    papers_data: list[PaperBatchUpdate],
+    session: AsyncSession = Depends(get_session),
+    current_admin: AdminUser = Depends(get_current_admin),
+):
+    """
+    Update many papers in one transaction, reporting an outcome per id.
+    """
+    check_batch_size(len(papers_data))
+    try:
+        results = await batch.update_papers(papers_data, session)
+        await refresh_statistics(session)
+        await session.commit()
+        invalidate(PUBLICATIONS, STATISTICS)
+
+        return {"msg": "Papers Updated Successfully", "data": results}
+    except Exception:
+        await session.rollback()
+        logger.exception("Error batch updating papers")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@admin_router.post("/batch/delete/papers")
+async def batch_delete_papers(
+    delete_data: BatchDelete,
+    session: AsyncSession = Depends(get_session),
+    current_admin: AdminUser = Depends(get_current_admin),
+):
+    """
+    Delete many papers in one transaction, reporting an outcome per id.
+    """
+    check_batch_size(len(delete_data.ids))
+    try:
+        results = await batch.delete_papers(delete_data.ids, session)
+        await refresh_statistics(session)
         await session.commit()
+        invalidate(PUBLICATIONS, STATISTICS)
 
-        return {"msg": "Paper Deleted Successfully", "data": paper_db}
-    except Exception as e:
-        print(f"Error deleting paper: {e}")
+        return {"msg": "Papers Deleted Successfully", "data": results}
+    except Exception:
+        await session.rollback()
+        logger.exception("Error batch deleting papers")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         )
 
 
+@admin_router.get("/cache_stats")
+async def get_cache_stats(current_admin: AdminUser = Depends(get_current_admin)):
+    """
+    Get hit, miss and eviction counters of the response and auth caches.
+    """
+    return {
+        "responses": response_cache.stats(),
+        "auth": auth_cache.stats(),
+        "media": media_cache.stats(),
+    }
+
+
+@admin_router.get("/login_stats")
+async def get_login_stats(current_admin: AdminUser = Depends(get_current_admin)):
+    """
+    Get allowed, throttled and failed login attempt counters.
+    """
+    return login_throttle.stats()
+
+
 @admin_router.get("/news", response_model=list[News])
 async def get_all_news(
     session: AsyncSession = Depends(get_session),
@@ -599,8 +793,8 @@ async def get_all_news(
         result = await session.exec(statement)
         news = result.all()
         return news
-    except Exception as e:
-        print(f"Error fetching news: {e}")
+    except Exception:
+        logger.exception("Error fetching news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -623,12 +817,14 @@ async def create_news(
 
         news = News(**news_dict)
         session.add(news)
+        await refresh_statistics(session)
         await session.commit()
+        invalidate(NEWS, STATISTICS)
         await session.refresh(news)
 
         return news
-    except Exception as e:
-        print(f"Error creating news: {e}")
+    except Exception:
+        logger.exception("Error creating news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -653,8 +849,8 @@ async def get_news(
         return news
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error fetching news: {e}")
+    except Exception:
+        logger.exception("Error fetching news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -686,12 +882,14 @@ async def update_news(
 
         news.sqlmodel_update(update_data)
         session.add(news)
+        await refresh_statistics(session)
         await session.commit()
+        invalidate(NEWS, STATISTICS)
         await session.refresh(news)
 
         return news
-    except Exception as e:
-        print(f"Error updating news: {e}")
+    except Exception:
+        logger.exception("Error updating news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -715,11 +913,65 @@ async def delete_news(
             )
 
         await session.delete(news)
+        await refresh_statistics(session)
         await session.commit()
+        invalidate(NEWS, STATISTICS)
 
         return {"msg": "News deleted successfully"}
-    except Exception as e:
-        print(f"Error deleting news: {e}")
+    except Exception:
+        logger.exception("Error deleting news")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@admin_router.patch("/batch/update/news")
+async def batch_update_news(
+    news_data: list[NewsBatchUpdate],
+    session: AsyncSession = Depends(get_session),
+    current_admin: AdminUser = Depends(get_current_admin),
+):
+    """
+    Update many news items in one transaction, reporting an outcome per id.
+    """
+    check_batch_size(len(news_data))
+    try:
+        results = await batch.update_news(news_data, session)
+        await refresh_statistics(session)
+        await session.commit()
+        invalidate(NEWS, STATISTICS)
+
+        return {"msg": "News updated successfully", "data": results}
+    except Exception:
+        await session.rollback()
+        logger.exception("Error batch updating news")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@admin_router.post("/batch/delete/news")
+async def batch_delete_news(
+    delete_data: BatchDelete,
+    session: AsyncSession = Depends(get_session),
+    current_admin: AdminUser = Depends(get_current_admin),
+):
+    """
+    Delete many news items in one transaction, reporting an outcome per id.
+    """
+    check_batch_size(len(delete_data.ids))
+    try:
+        results = await batch.delete_news(delete_data.ids, session)
+        await refresh_statistics(session)
+        await session.commit()
+        invalidate(NEWS, STATISTICS)
+
+        return {"msg": "News deleted successfully", "data": results}
+    except Exception:
+        await session.rollback()
+        logger.exception("Error batch deleting news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
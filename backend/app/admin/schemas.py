@@ -1,6 +1,7 @@
 from typing import Optional
 from pydantic import BaseModel, EmailStr
 from datetime import date
+import uuid
 
 
 class Publications(BaseModel):
@@ -61,6 +62,29 @@ class PaperCreate(BaseModel):
     types: list[str] | None = None
 
 
+class PaperDetail(BaseModel):
+    id: uuid.UUID
+    title: str
+    link: str
+    types: list[str]
+    pub_date: date
+    pub_date_str: str
+    abstract: str | None = None
+    citation_count: str | None = None
+    read_count: str | None = None
+    citation_count_num: int | None = None
+    read_count_num: int | None = None
+    authors: list[str]
+    reference_count: int = 0
+
+
+class ReferencePage(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    references: list[Reference]
+
+
 class PaperUpdate(BaseModel):
     title: str | None = None
     abstract: str | None = None
@@ -72,6 +96,10 @@ class PaperUpdate(BaseModel):
     types: list[str] | None = None
 
 
+class PaperBatchUpdate(PaperUpdate):
+    id: uuid.UUID
+
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -111,3 +139,24 @@ class NewsUpdate(BaseModel):
     image_url: Optional[str] = None
     news_type: Optional[str] = None
     is_featured: Optional[bool] = None
+
+
+class NewsBatchUpdate(NewsUpdate):
+    id: uuid.UUID
+
+
+class BatchDelete(BaseModel):
+    ids: list[uuid.UUID]
+
+
+class BatchResult(BaseModel):
+    id: uuid.UUID
+    status: str  # updated, deleted, not_found, invalid, duplicate
+    error: Optional[str] = None
+
+
+class Statistics(BaseModel):
+    publications_by_year: dict[str, int] = {}
+    publications_by_type: dict[str, int] = {}
+    news_by_type: dict[str, int] = {}
+    totals: dict[str, int] = {}
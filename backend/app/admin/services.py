@@ -1,10 +1,45 @@
-from playwright.async_api import async_playwright
-from parsel import Selector
+import logging
 import random
 
 from app.admin.schemas import Publications, ProfileCreate, PaperCreate, Reference
 from .utils import parse_date
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_URL = "https://www.researchgate.net/profile/Md-Alam-Hossain"
+
+
+def make_selector(content: str):
+    # parsel pulls in lxml, so it is only imported once a crawl runs
+    from parsel import Selector
+
+    return Selector(text=content)
+
+
+def profile_metrics(selector) -> dict:
+    """Total publications, reads and citations from a profile page"""
+    info = selector.css(
+        ".nova-legacy-o-grid.nova-legacy-o-grid--gutter-m.nova-legacy-o-grid--order-normal.nova-legacy-o-grid--horizontal-align-left.nova-legacy-o-grid--vertical-align-top"
+    )
+    return {
+        "total_pub": info.css(
+            'div[data-testid="publicProfileStatsPublications"]::text'
+        ).get(),
+        "reads": info.css('div[data-testid="publicProfileStatsReads"]::text').get(),
+        "total_citations": info.css(
+            'div[data-testid="publicProfileStatsCitations"]::text'
+        ).get(),
+    }
+
+
+def paper_metrics(selector) -> dict:
+    """Citation and read counts from a publication page"""
+    cite_read_card = selector.css(".chakra-stack.css-19gn7nw")
+    return {
+        "citation_count": cite_read_card[0].css(".chakra-text.css-1wq4449::text").get(),
+        "read_count": cite_read_card[1].css(".chakra-text.css-1wq4449::text").get(),
+    }
+
 
 class Services:
 
@@ -14,6 +49,9 @@ class Services:
         self.page = None
 
     async def initialize(self):
+        # Imported here so workers that never crawl never load playwright
+        from playwright.async_api import async_playwright
+
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
             headless=True,
@@ -28,7 +66,7 @@ class Services:
     async def list_down_all_publication(self, url: str | None = None):
         await self.initialize()
         if not url:
-            url = "https://www.researchgate.net/profile/Md-Alam-Hossain"
+            url = DEFAULT_PROFILE_URL
 
         research_list = []
 
@@ -37,7 +75,7 @@ class Services:
             await self.page.wait_for_timeout(random.randint(2000, 5000))  # Random delay
 
             content = await self.page.content()
-            selector = Selector(text=content)
+            selector = make_selector(content)
             pub_card = selector.css(
                 ".nova-legacy-c-card__body.nova-legacy-c-card__body--spacing-none"
             )
@@ -67,8 +105,8 @@ class Services:
                     )
                 )
 
-        except Exception as e:
-            print(f"Error: {e}")
+        except Exception:
+            logger.exception("Error crawling publication list")
             research_list = []
         finally:
             await self.close()
@@ -83,14 +121,14 @@ class Services:
         await self.initialize()
 
         if not url:
-            url = "https://www.researchgate.net/profile/Md-Alam-Hossain"
+            url = DEFAULT_PROFILE_URL
 
         try:
             await self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
             await self.page.wait_for_timeout(random.randint(2000, 5000))  # Random delay
 
             content = await self.page.content()
-            selector = Selector(text=content)
+            selector = make_selector(content)
 
             # Get profile picture and name using profile selector
             profile = selector.css(
@@ -100,16 +138,7 @@ class Services:
             name = profile.css(".nova-legacy-l-flex__item::text").get()
 
             # Get total publications, reads and total citations
-            info = selector.css(
-                ".nova-legacy-o-grid.nova-legacy-o-grid--gutter-m.nova-legacy-o-grid--order-normal.nova-legacy-o-grid--horizontal-align-left.nova-legacy-o-grid--vertical-align-top"
-            )
-            total_pub = info.css(
-                'div[data-testid="publicProfileStatsPublications"]::text'
-            ).get()
-            reads = info.css('div[data-testid="publicProfileStatsReads"]::text').get()
-            total_cit = info.css(
-                'div[data-testid="publicProfileStatsCitations"]::text'
-            ).get()
+            metrics = profile_metrics(selector)
 
             # Find skills
             about = selector.css('div[data-testid="publicProfileAboutSection"]')
@@ -134,9 +163,7 @@ class Services:
             return ProfileCreate(
                 name=name,
                 profile_pic=profile_pic,
-                total_pub=total_pub,
-                reads=reads,
-                total_citations=total_cit,
+                **metrics,
                 institution=ins_name,
                 department=dept_name,
                 address=address,
@@ -144,8 +171,8 @@ class Services:
                 skills=skills,
             )
 
-        except Exception as e:
-            print(f"Error: {e}")
+        except Exception:
+            logger.exception("Error crawling profile")
             selector = None
         finally:
             await self.close()
@@ -157,7 +184,7 @@ class Services:
             await self.page.wait_for_timeout(random.randint(2000, 5000))  # Random delay
 
             content = await self.page.content()
-            selector = Selector(text=content)
+            selector = make_selector(content)
 
             # Get title
             pub_title = selector.css(".chakra-heading.css-oum85n::text").get()
@@ -168,11 +195,8 @@ class Services:
             # Get publication date
             date_card = selector.css(".chakra-stack.css-1gw3h41")
             pub_date = date_card.css(".chakra-text.css-okc7pe::text").get()
-            # Get read count
-            cite_read_card = selector.css(".chakra-stack.css-19gn7nw")
-            read_count = cite_read_card[1].css(".chakra-text.css-1wq4449::text").get()
-            # Get citation count
-            cite_count = cite_read_card[0].css(".chakra-text.css-1wq4449::text").get()
+            # Get citation and read count
+            metrics = paper_metrics(selector)
             # Get author details
             authors_card_holder = selector.css(".css-14t9xag")
             authors_card = authors_card_holder.css(".chakra-stack.css-13nqvds")
@@ -185,18 +209,52 @@ class Services:
                 title=pub_title,
                 abstract=pub_abstract,
                 link=url,
-                citation_count=cite_count,
-                read_count=read_count,
+                **metrics,
                 pub_date=pub_date,
                 authors=author_name,
                 references=ref,
             )
 
-        except Exception as e:
-            print(f"Error: {e}")
+        except Exception:
+            logger.exception("Error crawling publication details from %s", url)
         finally:
             await self.close()
 
+    async def get_metrics(self, profile: bool, paper_urls: list[str]):
+        """
+        Fetch only the citation and read counts, in one browser session.
+
+        Unlike the full crawls this skips the reference pages. Returns the
+        profile metrics (None if not requested or failed) and the metrics
+        of each paper URL that could be read.
+        """
+        profile_result = None
+        papers = {}
+        await self.initialize()
+        try:
+            if profile:
+                try:
+                    profile_result = profile_metrics(
+                        await self.load_page(DEFAULT_PROFILE_URL)
+                    )
+                except Exception:
+                    logger.exception("Error crawling profile metrics")
+
+            for url in paper_urls:
+                try:
+                    papers[url] = paper_metrics(await self.load_page(url))
+                except Exception:
+                    logger.exception("Error crawling paper metrics from %s", url)
+        finally:
+            await self.close()
+
+        return profile_result, papers
+
+    async def load_page(self, url: str):
+        await self.page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        await self.page.wait_for_timeout(random.randint(2000, 5000))  # Random delay
+        return make_selector(await self.page.content())
+
     async def get_publication_ref(self, url: str):
         try:
             await self.initialize()
@@ -204,7 +262,7 @@ class Services:
             await self.page.wait_for_timeout(random.randint(2000, 5000))  # Random delay
 
             content = await self.page.content()
-            selector = Selector(text=content)
+            selector = make_selector(content)
 
             refs_card = selector.css(".chakra-card__body.css-1u34fbw")
             refs = refs_card.css(".css-1fym809")
@@ -226,7 +284,7 @@ class Services:
 
             return references
 
-        except Exception as e:
-            print(f"Error: {e}")
+        except Exception:
+            logger.exception("Error crawling publication references from %s", url)
         finally:
             await self.close()
@@ -0,0 +1,100 @@
+from collections import Counter
+
+from sqlalchemy import delete, extract, func, text
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import News, Paper, Publications, Statistic
+from app.admin.schemas import Statistics
+
+# pg_advisory_xact_lock key serializing the rewrite of the statistic rows
+STATISTICS_LOCK_KEY = 0x50A9E028
+
+
+async def compute_statistics(session: AsyncSession) -> dict[tuple[str, str], int]:
+    """Summary values keyed by (category, key), read straight from the data"""
+    rows: dict[tuple[str, str], int] = {}
+
+    year = extract("year", Publications.pub_date)
+    result = await session.exec(select(year, func.count()).group_by(year))
+    for pub_year, count in result.all():
+        if pub_year is not None:
+            rows[("publications_by_year", str(int(pub_year)))] = count
+
+    result = await session.exec(select(Publications.types))
+    type_counts = Counter(pub_type for types in result.all() for pub_type in types)
+    for pub_type, count in type_counts.items():
+        rows[("publications_by_type", pub_type)] = count
+
+    result = await session.exec(
+        select(News.news_type, func.count()).group_by(News.news_type)
+    )
+    for news_type, count in result.all():
+        rows[("news_by_type", news_type)] = count
+
+    result = await session.exec(
+        select(
+            select(func.count()).select_from(Publications).scalar_subquery(),
+            func.count(Paper.id),
+            func.coalesce(func.sum(Paper.citation_count_num), 0),
+            func.coalesce(func.sum(Paper.read_count_num), 0),
+        )
+    )
+    publications, papers, citations, reads = result.one()
+    result = await session.exec(
+        select(func.count(News.id), func.count(News.id).filter(News.is_featured))
+    )
+    news, featured_news = result.one()
+
+    totals = {
+        "publications": publications,
+        "papers": papers,
+        "citations": citations,
+        "reads": reads,
+        "news": news,
+        "featured_news": featured_news,
+    }
+    for name, value in totals.items():
+        rows[("totals", name)] = value
+    return rows
+
+
+async def refresh_statistics(session: AsyncSession):
+    """
+    Recompute the statistic rows inside the caller's transaction.
+
+    Called by every admin route that writes publications, papers or news,
+    right before it commits, so readers never see a stale summary. On
+    Postgres, concurrent writers take turns until commit; otherwise both
+    would delete and then insert the same keys.
+    """
+    if session.bind.dialect.name == "postgresql":
+        await session.exec(
+            text("SELECT pg_advisory_xact_lock(:key)"),
+            params={"key": STATISTICS_LOCK_KEY},
+        )
+    rows = await compute_statistics(session)
+
+    await session.exec(delete(Statistic))
+    session.add_all(
+        Statistic(category=category, key=key, value=value)
+        for (category, key), value in rows.items()
+    )
+
+
+async def get_statistics(session: AsyncSession) -> Statistics:
+    """
+    Read the precomputed statistic rows.
+
+    Until the first write fills them they are computed on the fly, without
+    writing from the read path.
+    """
+    result = await session.exec(select(Statistic))
+    rows = {(row.category, row.key): row.value for row in result.all()}
+    if not rows:
+        rows = await compute_statistics(session)
+
+    statistics = Statistics()
+    for (category, key), value in rows.items():
+        getattr(statistics, category)[key] = value
+    return statistics
@@ -0,0 +1,132 @@
+import time
+from collections import OrderedDict
+
+from app.config import Config
+
+
+class TokenBuckets:
+    """Token buckets per key, keeping at most max_keys keys in LRU order"""
+
+    def __init__(self, capacity: float, rate: float, max_keys: int):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def _refill(self, key: str, now: float) -> float:
+        tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def wait_time(self, key: str, now: float) -> float:
+        """Seconds until key has a token, 0 when one is available now"""
+        tokens = self._refill(key, now)
+        return 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+
+    def take(self, key: str, now: float):
+        self._buckets[key] = (self._refill(key, now) - 1, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def refund(self, key: str, now: float):
+        """Give back the token of an attempt that turned out legitimate"""
+        if key in self._buckets:
+            self._buckets[key] = (min(self.capacity, self._refill(key, now) + 1), now)
+
+
+class LoginThrottle:
+    """
+    Limit login attempts before any password is hashed.
+
+    Every attempt takes a token from the client IP's bucket and from one
+    global bucket, so the global rate bounds bcrypt work however the attack
+    is spread. On top of that, repeated failures from an IP lock it out for
+    an exponentially growing time. Nothing is keyed on the username alone,
+    so failures from strangers never lock an admin out.
+
+    A successful login gives its tokens back, so the buckets only bound
+    failed attempts. LOGIN_THROTTLE_ENABLED=false turns the throttle off.
+    """
+
+    def __init__(self):
+        max_keys = Config.LOGIN_THROTTLE_MAX_KEYS
+        self.per_client = TokenBuckets(
+            Config.LOGIN_BURST, Config.LOGIN_RATE_PER_SECOND, max_keys
+        )
+        self.overall = TokenBuckets(
+            Config.LOGIN_GLOBAL_BURST, Config.LOGIN_GLOBAL_RATE_PER_SECOND, 1
+        )
+        self.max_keys = max_keys
+        self._failures: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self.allowed = 0
+        self.throttled = 0
+        self.failed = 0
+
+    def check(self, client_ip: str) -> float | None:
+        """
+        Take a token for this attempt.
+
+        Returns the number of seconds to wait when the attempt is throttled,
+        or None when it may go ahead.
+        """
+        if not Config.LOGIN_THROTTLE_ENABLED:
+            return None
+
+        now = time.monotonic()
+        wait = max(
+            self.per_client.wait_time(client_ip, now),
+            self.overall.wait_time("*", now),
+            self._failures.get(client_ip, (0, now))[1] - now,
+        )
+        if wait > 0:
+            self.throttled += 1
+            return wait
+
+        self.per_client.take(client_ip, now)
+        self.overall.take("*", now)
+        self.allowed += 1
+        return None
+
+    def record_failure(self, client_ip: str):
+        if not Config.LOGIN_THROTTLE_ENABLED:
+            return
+
+        now = time.monotonic()
+        self.failed += 1
+
+        count = self._failures.get(client_ip, (0, now))[0] + 1
+        locked_until = now
+        if count > Config.LOGIN_FREE_FAILURES:
+            backoff = Config.LOGIN_BACKOFF_BASE * 2 ** (
+                count - Config.LOGIN_FREE_FAILURES - 1
+            )
+            locked_until = now + min(backoff, Config.LOGIN_BACKOFF_MAX)
+
+        self._failures[client_ip] = (count, locked_until)
+        self._failures.move_to_end(client_ip)
+        while len(self._failures) > self.max_keys:
+            self._failures.popitem(last=False)
+
+    def record_success(self, client_ip: str):
+        if not Config.LOGIN_THROTTLE_ENABLED:
+            return
+
+        now = time.monotonic()
+        self.per_client.refund(client_ip, now)
+        self.overall.refund("*", now)
+        self._failures.pop(client_ip, None)
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "throttled": self.throttled,
+            "failed": self.failed,
+            "locked_out": sum(
+                1
+                for _, locked_until in self._failures.values()
+                if locked_until > time.monotonic()
+            ),
+        }
+
+
+login_throttle = LoginThrottle()
@@ -1,10 +1,105 @@
-from dateutil.parser import parse
+import re
+from calendar import monthrange
+from dateutil.parser import parse, parserinfo
 from datetime import date
+from functools import lru_cache
+from typing import Iterable
 
+from app.admin.schemas import PaperDetail
 
-def parse_date(date_str: str) -> date:
+_PARSER_INFO = parserinfo()
+
+# Formats the scraper and the admin forms produce, e.g. "Oct 2024",
+# "January 2023", "2024-10-05", "Oct 5, 2024" and "5 Oct 2024"
+_MONTH_YEAR = re.compile(r"\s*([A-Za-z]+)\.?\s+(\d{4})\s*")
+_ISO_DATE = re.compile(r"\s*(\d{4})-(\d{1,2})-(\d{1,2})\s*")
+_MONTH_DAY_YEAR = re.compile(r"\s*([A-Za-z]+)\.?\s+(\d{1,2}),?\s+(\d{4})\s*")
+_DAY_MONTH_YEAR = re.compile(r"\s*(\d{1,2})\s+([A-Za-z]+)\.?,?\s+(\d{4})\s*")
+
+
+def _month(name: str) -> int | None:
+    return _PARSER_INFO.month(name)
+
+
+def _fast_parse(date_str: str, today: date) -> date | None:
+    """Parse the common formats directly, None when none of them match"""
+    if match := _MONTH_YEAR.fullmatch(date_str):
+        month = _month(match.group(1))
+        if month is None:
+            return None
+        year = int(match.group(2))
+        # Like dateutil, take the missing day from today, clamped to the month
+        return date(year, month, min(today.day, monthrange(year, month)[1]))
+
+    if match := _ISO_DATE.fullmatch(date_str):
+        year, month, day = (int(part) for part in match.groups())
+        return date(year, month, day)
+
+    if match := _MONTH_DAY_YEAR.fullmatch(date_str):
+        month, day, year = _month(match.group(1)), match.group(2), match.group(3)
+    elif match := _DAY_MONTH_YEAR.fullmatch(date_str):
+        day, month, year = match.group(1), _month(match.group(2)), match.group(3)
+    else:
+        return None
+
+    if month is None:
+        return None
+    return date(int(year), month, int(day))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_on(date_str: str, today: date) -> date:
+    # today is part of the memo key because dateutil fills missing fields
+    # from the current date
     try:
+        parsed_date = _fast_parse(date_str, today)
+    except ValueError:
+        parsed_date = None
+
+    if parsed_date is None:
         parsed_date = parse(date_str, fuzzy=True).date()
-        return parsed_date
+    return parsed_date
+
+
+def parse_date(date_str: str) -> date:
+    try:
+        return _parse_date_on(date_str, date.today())
     except Exception as e:
         raise ValueError(f"Invalid date format: {date_str}") from e
+
+
+def parse_dates(date_strs: Iterable[str]) -> list[date]:
+    """Parse many dates at once, e.g. for bulk imports"""
+    today = date.today()
+    parsed_dates = []
+    for date_str in date_strs:
+        try:
+            parsed_dates.append(_parse_date_on(date_str, today))
+        except Exception as e:
+            raise ValueError(f"Invalid date format: {date_str}") from e
+    return parsed_dates
+
+
+_COUNT_PATTERN = re.compile(r"(\d[\d,]*(?:\.\d+)?)\s*([kKmM])?")
+_COUNT_MULTIPLIERS = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_count(count_str: str | None) -> int | None:
+    """Parse a scraped metric such as "1,234" or "1.2k" into an integer"""
+    if not count_str:
+        return None
+
+    match = _COUNT_PATTERN.search(count_str)
+    if not match:
+        return None
+
+    number = float(match.group(1).replace(",", ""))
+    suffix = (match.group(2) or "").lower()
+    return int(number * _COUNT_MULTIPLIERS.get(suffix, 1))
+
+
+def paper_detail(paper, publication) -> PaperDetail:
+    """Combine a Paper row and its Publications row into one response model"""
+    return PaperDetail(
+        **publication.model_dump(), **paper.model_dump(exclude={"id"})
+    )
@@ -0,0 +1,256 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from app.config import Config
+
+# Resource families the public responses are grouped by. Admin writes
+# invalidate whole families, never single keys.
+PROFILE = "profile"
+PUBLICATIONS = "publications"
+NEWS = "news"
+STATISTICS = "statistics"
+FAMILIES = (PROFILE, PUBLICATIONS, NEWS, STATISTICS)
+
+# Responses combining several families, invalidated along with any of them
+HOME = "home"
+COMPOSITE_FAMILIES = {HOME: FAMILIES}
+
+_MISSING = object()
+
+
+class DataVersions:
+    """
+    Per-family data version counters, bumped by every admin write.
+
+    They only guard cached loads against a write that lands mid-load; the
+    ETags are hashes of the response bodies, so every worker agrees on
+    them. The epoch is random per process and names the worker on the
+    invalidation channel.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions: dict[str, int] = {}
+
+    def get(self, family: str) -> int:
+        return self._versions.get(family, 0)
+
+    def bump(self, *families: str):
+        for family in families:
+            self._versions[family] = self.get(family) + 1
+
+
+class _LeaderCancelled(Exception):
+    """The request running a shared load was cancelled before finishing"""
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical loads into one in-flight call.
+
+    The first caller for a key runs the loader; callers arriving while it
+    runs await the same result instead of issuing their own query. Counters
+    per key record how many callers were collapsed onto a shared load.
+    """
+
+    def __init__(self, max_tracked_keys: int = 1000):
+        self.max_tracked_keys = max_tracked_keys
+        self._inflight: dict[Any, asyncio.Future] = {}
+        self.loads: dict[str, int] = {}
+        self.collapsed: dict[str, int] = {}
+
+    def _count(self, counters: dict[str, int], name: str):
+        if name in counters or len(counters) < self.max_tracked_keys:
+            counters[name] = counters.get(name, 0) + 1
+
+    async def do(self, key: Any, name: str, loader: Callable[[], Awaitable[Any]]):
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+
+            self._count(self.collapsed, name)
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # Nobody is loading any more, so try to become the leader
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self._count(self.loads, name)
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+            # Followers retrieve the exception; mark it seen for the leader
+            if future.done() and not future.cancelled():
+                future.exception()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "loads": dict(self.loads),
+            "collapsed": dict(self.collapsed),
+        }
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache with a per-entry TTL.
+
+    Keys are (family, name) tuples so that a write can drop every entry of
+    a resource family at once. The cache lives in the worker process and is
+    only touched from the event loop, so it needs no locking.
+    """
+
+    def __init__(self, max_size: int, ttl: float, versions: DataVersions):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.versions = versions
+        self.single_flight = SingleFlight()
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple[str, str], default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: tuple[str, str], value: Any, ttl: float | None = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self, key: tuple[str, str], loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the cached value for key, or await loader and cache it.
+
+        Concurrent misses for the same key and data version share one load.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        version = self.versions.get(key[0])
+
+        async def load():
+            value = await loader()
+            # A write that landed while loading makes the value stale
+            if self.versions.get(key[0]) == version:
+                self.set(key, value)
+            return value
+
+        return await self.single_flight.do((key, version), ":".join(key), load)
+
+    def delete(self, key: tuple[str, str]):
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def invalidate(self, *families: str):
+        """Drop every entry belonging to the given resource families"""
+        for key in [key for key in self._entries if key[0] in families]:
+            del self._entries[key]
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "single_flight": self.single_flight.stats(),
+        }
+
+
+data_versions = DataVersions()
+response_cache = ResponseCache(
+    max_size=Config.RESPONSE_CACHE_MAX_SIZE,
+    ttl=Config.RESPONSE_CACHE_TTL,
+    versions=data_versions,
+)
+
+
+# Callbacks run after every invalidation, e.g. the static export trigger
+invalidation_listeners: list[Callable[[tuple[str, ...]], None]] = []
+
+
+def with_composites(families: tuple[str, ...]) -> tuple[str, ...]:
+    return families + tuple(
+        composite
+        for composite, parts in COMPOSITE_FAMILIES.items()
+        if composite not in families and any(family in parts for family in families)
+    )
+
+
+def invalidate_local(*families: str):
+    """Drop this worker's cached data for the families"""
+    families = with_composites(families)
+    data_versions.bump(*families)
+    response_cache.invalidate(*families)
+
+
+def invalidate(*families: str):
+    """Called by the admin routes after a committed write to the families"""
+    invalidate_local(*families)
+
+    for listener in invalidation_listeners:
+        listener(families)
+
+
+def public_cache_control() -> str:
+    return (
+        f"public, max-age={Config.PUBLIC_CACHE_MAX_AGE}, "
+        f"stale-while-revalidate={Config.PUBLIC_STALE_WHILE_REVALIDATE}"
+    )
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.cache import FAMILIES, data_versions, invalidate_local
+from app.config import Config
+from app.db import engine
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker in the events, so it can skip its own
+WORKER_ID = data_versions.epoch
+
+# Called with the username of an admin changed on another worker, or None
+# after a reconnect for every admin; admin workers add their auth cache
+admin_event_listeners: list[Callable[[str | None], None]] = []
+
+_pending_publishes: set[asyncio.Task] = set()
+
+
+async def _notify(event: dict):
+    payload = json.dumps({"origin": WORKER_ID, **event})
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": Config.CACHE_NOTIFY_CHANNEL, "payload": payload},
+            )
+            await conn.commit()
+    except Exception:
+        logger.exception("Error publishing cache invalidation")
+
+
+def publish_invalidation(families: tuple[str, ...]):
+    """
+    Invalidation listener that tells the other workers about a write.
+
+    It runs after the write has committed, so a worker that receives the
+    event always reloads the new data.
+    """
+    _publish({"families": list(families)})
+
+
+def publish_admin_invalidation(username: str):
+    """Admin invalidation listener that drops the principal on other workers"""
+    _publish({"admin": username})
+
+
+def _publish(event: dict):
+    task = asyncio.get_running_loop().create_task(_notify(event))
+    _pending_publishes.add(task)
+    task.add_done_callback(_pending_publishes.discard)
+
+
+def _handle_event(connection, pid, channel, payload):
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed cache invalidation: %s", payload)
+        return
+
+    if event.get("origin") == WORKER_ID:
+        return
+    if isinstance(event.get("admin"), str):
+        for listener in admin_event_listeners:
+            listener(event["admin"])
+    families = [family for family in event.get("families", []) if family in FAMILIES]
+    if families:
+        invalidate_local(*families)
+
+
+async def listen_for_invalidations(retry_delay: float = 1.0, max_delay: float = 30.0):
+    """
+    Evict local cache entries whenever another worker publishes a write.
+
+    Runs for the lifetime of the application on its own connection. After a
+    reconnect every family and admin principal is dropped, because events may
+    have been missed.
+    """
+    url = make_url(Config.POSTGRES_URL).set(drivername="postgresql")
+    dsn = url.render_as_string(hide_password=False)
+    delay = retry_delay
+
+    while True:
+        connection = None
+        try:
+            connection = await asyncpg.connect(dsn)
+            await connection.add_listener(Config.CACHE_NOTIFY_CHANNEL, _handle_event)
+            invalidate_local(*FAMILIES)
+            for listener in admin_event_listeners:
+                listener(None)
+            delay = retry_delay
+
+            closed = asyncio.Event()
+            connection.add_termination_listener(lambda _: closed.set())
+            await closed.wait()
+            logger.warning("Cache invalidation listener disconnected")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Error in cache invalidation listener")
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
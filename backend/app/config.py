@@ -4,6 +4,85 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Setting(BaseSettings):
     POSTGRES_URL: str
 
+    # Log every SQL statement; the query profiler below is far quieter
+    SQL_ECHO: bool = False
+
+    # Per-request query counts, DB time, slow queries and N+1 detection
+    QUERY_PROFILE_ENABLED: bool = False
+    QUERY_PROFILE_SAMPLE_RATE: float = 1.0
+    QUERY_PROFILE_SLOW_MS: float = 100.0
+    QUERY_PROFILE_REPEAT_THRESHOLD: int = 10
+
+    # In-process cache for the public /user responses
+    RESPONSE_CACHE_MAX_SIZE: int = 1024
+    RESPONSE_CACHE_TTL: float = 300.0
+
+    # Verified tokens and admin principals, kept briefly to skip the DB
+    AUTH_CACHE_MAX_SIZE: int = 256
+    AUTH_CACHE_TTL: float = 60.0
+
+    # Threads used for bcrypt, which caps concurrent hash operations
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Login throttling, applied before any bcrypt work
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_BURST: float = 5
+    LOGIN_RATE_PER_SECOND: float = 0.2
+    LOGIN_GLOBAL_BURST: float = 20
+    LOGIN_GLOBAL_RATE_PER_SECOND: float = 5
+    LOGIN_FREE_FAILURES: int = 3
+    LOGIN_BACKOFF_BASE: float = 1.0
+    LOGIN_BACKOFF_MAX: float = 900.0
+    LOGIN_THROTTLE_MAX_KEYS: int = 10000
+
+    # Streaming NDJSON import
+    IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_MAX_LINE_BYTES: int = 1_000_000
+
+    # Largest number of ids accepted by one batch update/delete
+    BATCH_MAX_SIZE: int = 1000
+
+    # Cache-Control sent with the public /user responses
+    PUBLIC_CACHE_MAX_AGE: int = 60
+    PUBLIC_STALE_WHILE_REVALIDATE: int = 300
+
+    # Pre-compressed variants of the cached public responses
+    SNAPSHOT_GZIP: bool = True
+    SNAPSHOT_GZIP_MIN_SIZE: int = 1024
+
+    # Regenerate the static export in this directory after admin writes
+    STATIC_EXPORT_DIR: str | None = None
+    STATIC_EXPORT_DELAY: float = 5.0
+
+    # Postgres channel used to share cache invalidations between workers
+    CACHE_NOTIFY_CHANNEL: str | None = "paper_space_invalidation"
+
+    # Logging goes through a queue to a background thread, rate-limited
+    # per message template
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_RATE_PER_SECOND: float = 5.0
+    LOG_BURST: float = 20
+
+    # Periodic re-fetch of citation/read counts, run by one worker at a time
+    METRICS_REFRESH_ENABLED: bool = False
+    METRICS_REFRESH_INTERVAL: float = 3600.0
+    METRICS_REFRESH_JITTER: float = 0.2
+    METRICS_REFRESH_BATCH: int = 10
+    METRICS_REFRESH_MIN_AGE: float = 86400.0
+
+    # Resized copies of the profile and news images served by /user/media
+    MEDIA_CACHE_DIR: str = "media_cache"
+    MEDIA_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    MEDIA_MAX_SOURCE_BYTES: int = 10 * 1024 * 1024
+    MEDIA_FETCH_TIMEOUT: float = 10.0
+    MEDIA_WEBP: bool = True
+    MEDIA_QUALITY: int = 80
+    MEDIA_REDIRECT_MAX_AGE: int = 3600
+
+    # Per-route request metrics, served on /metrics
+    METRICS_ENABLED: bool = True
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
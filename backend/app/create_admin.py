@@ -4,7 +4,7 @@ from sqlmodel import select
 
 from app.db import engine
 from app.admin.models import AdminUser
-from app.admin.auth import get_password_hash
+from app.admin.auth import get_password_hash_async
 
 
 async def create_initial_admin():
@@ -23,7 +23,7 @@ async def create_initial_admin():
             email = "admin@example.com"
             password = "admin123"  # Change this to a strong password
 
-            hashed_password = get_password_hash(password)
+            hashed_password = await get_password_hash_async(password)
             admin = AdminUser(
                 username=username, email=email, hashed_password=hashed_password
             )
@@ -1,19 +1,52 @@
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
 
 from app.config import Config
+from app.migrations import migrate, rename_legacy_tables
+from app.query_profiler import install_query_profiler
 
-engine = create_async_engine(url=Config.POSTGRES_URL, echo=True, future=True)
+engine = create_async_engine(url=Config.POSTGRES_URL, echo=Config.SQL_ECHO, future=True)
+if Config.QUERY_PROFILE_ENABLED:
+    install_query_profiler(engine.sync_engine)
+
+
+def create_missing_indexes(conn):
+    # create_all skips tables that already exist, so indexes added to a model
+    # later would never reach an existing database
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+# pg_advisory_xact_lock key held while a worker creates and migrates tables
+SCHEMA_LOCK_KEY = 0x50A9E050
 
 
 async def init_db():
     async with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            # Workers start together; the first one migrates and the others
+            # wait for its commit, then find nothing left to do
+            await conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+            )
+        await conn.run_sync(rename_legacy_tables)
         await conn.run_sync(SQLModel.metadata.create_all)
+        await migrate(conn)
+        await conn.run_sync(create_missing_indexes)
+
+
+async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_session():
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     async with async_session() as session:
         yield session
+
+
+def get_session_factory():
+    """For routes that run queries concurrently, each on its own session"""
+    return async_session
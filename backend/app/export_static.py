@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+
+import httpx
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.config import Config
+from app.db import engine
+from app.admin.metrics_refresh import SKIP_VIEW_HEADER
+from app.admin.models import News, Paper
+from app.admin.references import REFERENCES_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Builds are made next to the export directory, which links to the latest
+BUILD_PREFIX = ".export-"
+
+# Public endpoints exported as-is; papers, their reference pages and news
+# items are added per id
+STATIC_PATHS = [
+    "/user/home",
+    "/user/get_profile",
+    "/user/get_all_research",
+    "/user/most_cited",
+    "/user/most_read",
+    "/user/statistics",
+    "/user/news",
+]
+
+
+async def list_paths() -> list[str]:
+    """
+    All public endpoint paths, including one per paper and news item.
+
+    A paper's references are exported in default-sized pages addressed by
+    path: the bare path, then /references/{offset} per further page, the
+    same paths the frontend requests.
+    """
+    async with AsyncSession(engine) as session:
+        papers = (await session.exec(select(Paper.id, Paper.reference_count))).all()
+        news_ids = (await session.exec(select(News.id))).all()
+
+    reference_paths = []
+    for paper_id, reference_count in papers:
+        if reference_count:
+            reference_paths.append(f"/user/paper/{paper_id}/references")
+        for offset in range(
+            REFERENCES_PAGE_SIZE, reference_count, REFERENCES_PAGE_SIZE
+        ):
+            reference_paths.append(f"/user/paper/{paper_id}/references/{offset}")
+
+    return (
+        STATIC_PATHS
+        + [f"/user/paper/{paper_id}" for paper_id, _ in papers]
+        + reference_paths
+        + [f"/user/news/{news_id}" for news_id in news_ids]
+    )
+
+
+def write_variants(directory: str, path: str, body: bytes) -> dict:
+    """Write path.json with its .gz and .br variants, return its manifest entry"""
+    file_name = path.lstrip("/") + ".json"
+    file_path = os.path.join(directory, file_name)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    with open(file_path, "wb") as f:
+        f.write(body)
+    entry = {
+        "file": file_name,
+        "size": len(body),
+        "sha256": hashlib.sha256(body).hexdigest(),
+    }
+
+    with open(file_path + ".gz", "wb") as f:
+        compressed = gzip.compress(body, compresslevel=9)
+        f.write(compressed)
+    entry["gzip_size"] = len(compressed)
+
+    if brotli is not None:
+        with open(file_path + ".br", "wb") as f:
+            compressed = brotli.compress(body, quality=11)
+            f.write(compressed)
+        entry["br_size"] = len(compressed)
+
+    return entry
+
+
+def publish_build(out_dir: str, build_dir: str):
+    """
+    Point the out_dir symlink at build_dir, then remove the older builds.
+
+    Must hold the export lock. Builds only get their manifest under the
+    lock, so every other complete build in the parent is stale, while
+    exports still running are left alone.
+    """
+    parent = os.path.dirname(out_dir)
+    if os.path.isdir(out_dir) and not os.path.islink(out_dir):
+        # A tree from before exports were symlinked; replaced once
+        shutil.rmtree(out_dir)
+
+    link = out_dir + ".link"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(build_dir), link)
+    os.replace(link, out_dir)
+
+    for entry in os.scandir(parent):
+        if (
+            entry.name.startswith(BUILD_PREFIX)
+            and entry.path != build_dir
+            and os.path.exists(os.path.join(entry.path, "manifest.json"))
+        ):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+async def export_static(out_dir: str) -> dict:
+    """
+    Export every public /user response to static JSON files in out_dir.
+
+    The responses are fetched through the application itself, so the files
+    match what the API serves. out_dir is a symlink to the current build:
+    each export is built in a sibling directory and the link is replaced
+    atomically, so readers always see one complete tree.
+    """
+    from app.public import app
+
+    out_dir = os.path.abspath(out_dir)
+    parent = os.path.dirname(out_dir)
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=BUILD_PREFIX, dir=parent)
+    # mkdtemp makes it private, but the web server has to read it
+    os.chmod(build_dir, 0o755)
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "files": {},
+    }
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://export"
+        ) as client:
+            for path in await list_paths():
+                response = await client.get(
+                    path,
+                    headers={"Accept-Encoding": "identity", SKIP_VIEW_HEADER: "1"},
+                )
+                if response.status_code != 200:
+                    logger.warning("Skipping %s: status %s", path, response.status_code)
+                    continue
+                manifest["files"][path] = write_variants(
+                    build_dir, path, response.content
+                )
+
+        with open(os.path.join(parent, ".export.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(os.path.join(build_dir, "manifest.json"), "w") as f:
+                json.dump(manifest, f, indent=2)
+            publish_build(out_dir, build_dir)
+    except Exception:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    return manifest
+
+
+_export_task: asyncio.Task | None = None
+_export_pending = False
+
+
+async def _run_scheduled_export():
+    global _export_pending
+
+    while _export_pending:
+        _export_pending = False
+        # Let a burst of admin writes settle into one export
+        await asyncio.sleep(Config.STATIC_EXPORT_DELAY)
+        try:
+            manifest = await export_static(Config.STATIC_EXPORT_DIR)
+            logger.info("Static export written: %d files", len(manifest["files"]))
+        except Exception:
+            logger.exception("Error exporting static site")
+
+
+def schedule_export(families: tuple[str, ...] = ()):
+    """
+    Invalidation listener that regenerates the static export after a write.
+
+    Writes that arrive while an export is running trigger one more export.
+    """
+    global _export_task, _export_pending
+
+    _export_pending = True
+    if _export_task is None or _export_task.done():
+        _export_task = asyncio.get_running_loop().create_task(_run_scheduled_export())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export all public API responses as static JSON files"
+    )
+    parser.add_argument(
+        "out_dir",
+        nargs="?",
+        default=Config.STATIC_EXPORT_DIR or "static_export",
+        help="Directory to write the export to",
+    )
+    args = parser.parse_args()
+
+    manifest = asyncio.run(export_static(args.out_dir))
+    print(f"Exported {len(manifest['files'])} files to {args.out_dir}")
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.admin.metrics_refresh import run_metrics_refresh
+from app.cache import invalidation_listeners
+from app.cache_events import (
+    admin_event_listeners,
+    listen_for_invalidations,
+    publish_admin_invalidation,
+    publish_invalidation,
+)
+from app.config import Config
+from app.db import engine, init_db
+from app.logging_config import RequestContextMiddleware, setup_logging
+from app.metrics import MetricsMiddleware, metrics_endpoint
+from app.query_profiler import QueryProfilerMiddleware
+from app.user.routes import user_router
+
+logger = logging.getLogger(__name__)
+
+
+def create_app(admin: bool = True) -> FastAPI:
+    """
+    Build the ASGI application.
+
+    With admin=False only the public /user routes are mounted, and neither
+    the admin routes nor their dependencies (passlib, jose and the crawler
+    stack) are ever imported. Public-only workers can run app.public:app.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        logger.info("Initializing Database.....")
+        await init_db()
+        if admin and Config.STATIC_EXPORT_DIR:
+            from app.export_static import schedule_export
+
+            invalidation_listeners.append(schedule_export)
+
+        listener_task = None
+        if Config.CACHE_NOTIFY_CHANNEL and engine.dialect.name == "postgresql":
+            if admin:
+                from app.admin.auth import (
+                    admin_invalidation_listeners,
+                    invalidate_admin_local,
+                )
+
+                invalidation_listeners.append(publish_invalidation)
+                admin_invalidation_listeners.append(publish_admin_invalidation)
+                admin_event_listeners.append(invalidate_admin_local)
+            listener_task = asyncio.create_task(listen_for_invalidations())
+
+        refresh_task = None
+        if Config.METRICS_REFRESH_ENABLED:
+            refresh_task = asyncio.create_task(run_metrics_refresh(crawl=admin))
+
+        yield
+
+        logger.info("Closing application.....")
+        # Wait for the tasks to finish, so the listener closes its connection
+        # before the engine goes away
+        for task in (listener_task, refresh_task):
+            if task:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    setup_logging()
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.add_middleware(RequestContextMiddleware)
+    if Config.QUERY_PROFILE_ENABLED:
+        app.add_middleware(QueryProfilerMiddleware)
+    if Config.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+        app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+    @app.get("/")
+    async def root():
+        return {"message": "Hello World"}
+
+    if admin:
+        from app.admin.routes import admin_router
+
+        app.include_router(admin_router, prefix="/admin")
+    app.include_router(user_router, prefix="/user")
+
+    return app
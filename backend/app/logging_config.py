@@ -0,0 +1,189 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+import traceback
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Config
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Per-request fields copied onto every record logged while handling it
+request_context: ContextVar[dict | None] = ContextVar("request_context", default=None)
+
+# Rate-limit buckets kept at most; the oldest is dropped beyond this
+MAX_RATE_LIMIT_KEYS = 1024
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach request id, route and elapsed time to records"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = request_context.get()
+        if context is not None:
+            scope = context["scope"]
+            route = scope.get("route")
+            record.request_id = context["request_id"]
+            record.method = scope["method"]
+            record.route = route.path if route is not None else scope["path"]
+            record.latency_ms = round(
+                (time.perf_counter() - context["start"]) * 1000, 2
+            )
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket per logger, level and message template.
+
+    Messages should use %-style arguments rather than f-strings, so that
+    repeats of one error share a bucket. The first record let through after
+    a burst reports how many were suppressed.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.buckets: dict[tuple, list[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        bucket = self.buckets.pop(key, None)
+        if bucket is None:
+            bucket = [self.burst, now, 0]
+            if len(self.buckets) >= MAX_RATE_LIMIT_KEYS:
+                del self.buckets[next(iter(self.buckets))]
+        # Re-inserting keeps the dict ordered by last use
+        self.buckets[key] = bucket
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            bucket[2] += 1
+            return False
+
+        bucket[0] = tokens - 1
+        if bucket[2]:
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue the record as is, leaving all formatting to the listener thread.
+
+    The stock QueueHandler formats in prepare(), which would put message
+    interpolation and traceback rendering back on the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_EXTRA_FIELDS = ("request_id", "method", "route", "latency_ms", "suppressed")
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in _EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = "".join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging():
+    """
+    Route all logging through a queue drained by a background thread.
+
+    Safe to call more than once; only the first call configures logging.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if Config.LOG_JSON:
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        )
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(
+        RateLimitFilter(Config.LOG_RATE_PER_SECOND, Config.LOG_BURST)
+    )
+    queue_handler.addFilter(RequestContextFilter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(Config.LOG_LEVEL)
+    app_logger.addHandler(queue_handler)
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+class RequestContextMiddleware:
+    """
+    Give each request an id for its log records and echo it in the response.
+
+    An incoming X-Request-ID header is reused so ids can follow a request
+    through a proxy.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = request_context.set(
+            {"request_id": request_id, "scope": scope, "start": time.perf_counter()}
+        )
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_context.reset(token)
@@ -0,0 +1,258 @@
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+
+import httpx
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import News, Profile
+from app.cache import SingleFlight
+from app.config import Config
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow is optional
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+# Requested widths are rounded up to one of these to bound the variants
+MEDIA_WIDTHS = (64, 128, 256, 512, 1024, 2048)
+
+CONTENT_TYPES = {
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "gif": "image/gif",
+    "bin": "application/octet-stream",
+}
+EXTENSIONS = {content_type: ext for ext, content_type in CONTENT_TYPES.items()}
+
+# Variant files are named after a hash of their content
+MEDIA_NAME = re.compile(r"^[0-9a-f]{32}\.(?:webp|jpeg|png|gif|bin)$")
+
+
+class MediaError(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def variant_width(width: int) -> int:
+    for size in MEDIA_WIDTHS:
+        if width <= size:
+            return size
+    return MEDIA_WIDTHS[-1]
+
+
+def make_variant(data: bytes, content_type: str, width: int, fmt: str):
+    """
+    Resize an image to at most width pixels wide and encode it.
+
+    fmt is "webp" or "original"; original keeps JPEG as JPEG and writes
+    everything else as PNG. Without Pillow the source is stored unchanged.
+    Returns the encoded bytes and the file extension.
+    """
+    if Image is None:
+        return data, EXTENSIONS.get(content_type, "bin")
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        source_format = image.format
+        image = ImageOps.exif_transpose(image)
+    except Exception as e:
+        raise MediaError(502, "Source is not a readable image") from e
+
+    if image.width > width:
+        image.thumbnail((width, image.height))
+
+    output = io.BytesIO()
+    if fmt == "webp":
+        image.save(output, "WEBP", quality=Config.MEDIA_QUALITY, method=4)
+        return output.getvalue(), "webp"
+    if source_format == "JPEG" or (
+        source_format != "PNG" and image.mode not in ("RGBA", "LA", "P")
+    ):
+        image.convert("RGB").save(
+            output, "JPEG", quality=Config.MEDIA_QUALITY, optimize=True
+        )
+        return output.getvalue(), "jpeg"
+    image.save(output, "PNG", optimize=True)
+    return output.getvalue(), "png"
+
+
+class MediaCache:
+    """
+    Size-bounded directory of image variants, evicting least recently used.
+
+    The directory is the only state: workers sharing it see the same files
+    and the size bound holds for all of them together, with use recorded
+    in the file mtimes. Each variant key (source URL, width, format) has a
+    small .ref file naming the content-hashed variant file, so lookups
+    survive restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.flight = SingleFlight()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def lookup(self, key: str) -> str | None:
+        try:
+            with open(self.path(key + ".ref")) as f:
+                name = f.read().strip()
+        except OSError:
+            return None
+        return name if MEDIA_NAME.match(name) and self.touch(name) else None
+
+    def touch(self, name: str) -> bool:
+        """Mark a variant as used; False if it is not in the cache"""
+        try:
+            os.utime(self.path(name))
+        except OSError:
+            return False
+        return True
+
+    def _replace(self, name: str, data: bytes):
+        # Unique temporary name, as several workers may write the same file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self.path(name))
+
+    def _write(self, key: str, name: str, body: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        if not self.touch(name):
+            self._replace(name, body)
+        self._replace(key + ".ref", name.encode())
+
+    def _scan(self) -> tuple[list[tuple[float, str, int]], list[str]]:
+        """Variants as (mtime, name, size), oldest first, and the .ref files"""
+        variants, refs = [], []
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return variants, refs
+        for entry in entries:
+            try:
+                if MEDIA_NAME.match(entry.name):
+                    stat = entry.stat()
+                    variants.append((stat.st_mtime, entry.name, stat.st_size))
+                elif entry.name.endswith(".ref"):
+                    refs.append(entry.name)
+            except FileNotFoundError:
+                # Removed by another worker meanwhile
+                continue
+        variants.sort()
+        return variants, refs
+
+    def _remove(self, name: str):
+        try:
+            os.remove(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """
+        Remove the least recently used variants beyond max_bytes, keeping the
+        newest, then the .ref files naming variants that are gone.
+        """
+        variants, refs = self._scan()
+        total_bytes = sum(size for _, _, size in variants)
+        kept = {name for _, name, _ in variants}
+        for _, name, size in variants[:-1]:
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(name)
+            kept.discard(name)
+            total_bytes -= size
+        if len(kept) == len(variants):
+            return
+
+        for ref in refs:
+            try:
+                with open(self.path(ref)) as f:
+                    name = f.read().strip()
+            except OSError:
+                continue
+            if name not in kept:
+                self._remove(ref)
+
+    async def store(self, key: str, body: bytes, ext: str) -> str:
+        name = f"{hashlib.sha256(body).hexdigest()[:32]}.{ext}"
+        await asyncio.to_thread(self._write, key, name, body)
+        await asyncio.to_thread(self._evict)
+        return name
+
+    def stats(self) -> dict:
+        variants, refs = self._scan()
+        return {
+            "files": len(variants),
+            "refs": len(refs),
+            "bytes": sum(size for _, _, size in variants),
+            "max_bytes": self.max_bytes,
+            **self.flight.stats(),
+        }
+
+
+media_cache = MediaCache(Config.MEDIA_CACHE_DIR, Config.MEDIA_CACHE_MAX_BYTES)
+
+
+async def is_known_image(src: str, session: AsyncSession) -> bool:
+    """Only images referenced by the profile or news are proxied"""
+    result = await session.exec(select(Profile.id).where(Profile.profile_pic == src))
+    if result.first() is not None:
+        return True
+    result = await session.exec(select(News.id).where(News.image_url == src))
+    return result.first() is not None
+
+
+async def fetch_source(src: str) -> tuple[bytes, str]:
+    try:
+        async with httpx.AsyncClient(
+            timeout=Config.MEDIA_FETCH_TIMEOUT, follow_redirects=True
+        ) as client:
+            async with client.stream("GET", src) as response:
+                response.raise_for_status()
+                chunks, size = [], 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > Config.MEDIA_MAX_SOURCE_BYTES:
+                        raise MediaError(502, "Source image too large")
+                    chunks.append(chunk)
+                content_type = response.headers.get("content-type", "")
+    except httpx.HTTPError as e:
+        raise MediaError(502, "Could not fetch source image") from e
+    return b"".join(chunks), content_type.split(";")[0].strip()
+
+
+async def get_variant(src: str, width: int, fmt: str, session: AsyncSession) -> str:
+    """
+    Return the file name of the variant of src, building it on first use.
+
+    Concurrent requests for the same missing variant share one fetch.
+    """
+    key = hashlib.sha256(f"{src}\n{width}\n{fmt}".encode()).hexdigest()
+    name = media_cache.lookup(key)
+    if name is not None:
+        return name
+
+    async def build():
+        if not await is_known_image(src, session):
+            raise MediaError(404, "Unknown image")
+        data, content_type = await fetch_source(src)
+        body, ext = await asyncio.to_thread(
+            make_variant, data, content_type, width, fmt
+        )
+        return await media_cache.store(key, body, ext)
+
+    return await media_cache.flight.do(key, "media", build)
@@ -0,0 +1,183 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Requests that match no route share one label so scanners can't grow it
+UNMATCHED_ROUTE = "<unmatched>"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, no locking needed"""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            yield _format_value(bound), cumulative
+        yield "+Inf", self.count
+
+
+class HTTPMetrics:
+    """
+    Request counters for one worker process.
+
+    Everything runs on the event loop thread, so plain dicts are enough.
+    """
+
+    def __init__(self):
+        self.requests = defaultdict(int)
+        self.in_progress = defaultdict(int)
+        self.latency = {}
+        self.sizes = {}
+
+    def observe(self, method: str, route: str, status: int, duration: float, size: int):
+        self.requests[(method, route, str(status))] += 1
+
+        key = (method, route)
+        latency = self.latency.get(key)
+        if latency is None:
+            latency = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.sizes[key] = Histogram(SIZE_BUCKETS)
+        latency.observe(duration)
+        self.sizes[key].observe(size)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP http_requests_total Requests handled, by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(self.requests.items()):
+            labels = _labels(method=method, route=route, status=status)
+            lines.append(f"http_requests_total{labels} {value}")
+
+        lines += [
+            "# HELP http_requests_in_progress Requests currently being handled.",
+            "# TYPE http_requests_in_progress gauge",
+        ]
+        for router, value in sorted(self.in_progress.items()):
+            lines.append(f"http_requests_in_progress{_labels(router=router)} {value}")
+
+        _render_histograms(
+            lines,
+            "http_request_duration_seconds",
+            "Time from request start to the last body chunk.",
+            self.latency,
+        )
+        _render_histograms(
+            lines,
+            "http_response_size_bytes",
+            "Response body size.",
+            self.sizes,
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _render_histograms(lines: list[str], name: str, help_text: str, histograms):
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in sorted(histograms.items()):
+        for bound, count in histogram.samples():
+            labels = _labels(method=method, route=route, le=bound)
+            lines.append(f"{name}_bucket{labels} {count}")
+        labels = _labels(method=method, route=route)
+        lines.append(f"{name}_sum{labels} {histogram.total}")
+        lines.append(f"{name}_count{labels} {histogram.count}")
+
+
+http_metrics = HTTPMetrics()
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Plain Starlette routes such as /metrics and /docs set no "route"
+    if "endpoint" in scope:
+        return scope["path"]
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding http_metrics.
+
+    Routes are labelled with their path template (e.g. /user/paper/{paper_id})
+    once routing has run, so the label set stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: HTTPMetrics = http_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        router = scope["path"].split("/", 2)[1]
+        if router not in ("admin", "user"):
+            router = "other"
+        start = time.perf_counter()
+        status_code = 500
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        metrics.in_progress[router] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_progress[router] -= 1
+            metrics.observe(
+                scope["method"],
+                _route_label(scope),
+                status_code,
+                time.perf_counter() - start,
+                size,
+            )
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(http_metrics.render(), media_type=CONTENT_TYPE)
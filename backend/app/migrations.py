@@ -0,0 +1,236 @@
+import logging
+import uuid
+from datetime import date
+
+from sqlalchemy import MetaData, Table, inspect, insert, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import Paper, Profile, Publications, Statistic
+from app.admin.references import (
+    CHUNK_SIZE,
+    migrate_inline_references,
+    store_references,
+)
+from app.admin.schemas import Reference as ReferenceCreate
+from app.admin.statistics import refresh_statistics
+from app.admin.utils import parse_count, parse_date
+
+logger = logging.getLogger(__name__)
+
+# The first paper table had its own id, title, link and pub_date; it is
+# renamed out of the way and its rows copied into the current tables
+LEGACY_PAPER_TABLE = "paper_legacy"
+
+# Parsed copies of the scraped metrics, filled when their column is added
+PARSED_COUNTS = {
+    Profile: {
+        "total_pub_num": "total_pub",
+        "reads_num": "reads",
+        "total_citations_num": "total_citations",
+    },
+    Paper: {"citation_count_num": "citation_count", "read_count_num": "read_count"},
+}
+
+
+def _columns(conn, table: str) -> set[str]:
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return set()
+    return {column["name"] for column in inspector.get_columns(table)}
+
+
+def rename_legacy_tables(conn):
+    """Move the first paper table aside so create_all can build the new one"""
+    if "title" not in _columns(conn, "paper"):
+        return
+
+    logger.info("Renaming the old paper table to %s", LEGACY_PAPER_TABLE)
+    conn.execute(text(f"ALTER TABLE paper RENAME TO {LEGACY_PAPER_TABLE}"))
+    if conn.dialect.name == "postgresql":
+        # The primary key index keeps its name, which the new table needs
+        conn.execute(
+            text(
+                f"ALTER TABLE {LEGACY_PAPER_TABLE} "
+                f"RENAME CONSTRAINT paper_pkey TO {LEGACY_PAPER_TABLE}_pkey"
+            )
+        )
+
+
+def add_missing_columns(conn) -> set[tuple[str, str]]:
+    """
+    Add model columns missing from existing tables, which create_all skips.
+
+    Columns with a server default are added NOT NULL with that default,
+    others as nullable. Returns the (table, column) pairs that were added.
+    """
+    preparer = conn.dialect.identifier_preparer
+    added = set()
+    for table in SQLModel.metadata.sorted_tables:
+        existing = _columns(conn, table.name)
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = (
+                f"ALTER TABLE {preparer.quote(table.name)} "
+                f"ADD COLUMN {preparer.quote(column.name)} "
+                f"{column.type.compile(dialect=conn.dialect)}"
+            )
+            if column.server_default is not None:
+                ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+            conn.execute(text(ddl))
+            added.add((table.name, column.name))
+    return added
+
+
+async def backfill_parsed_counts(session: AsyncSession, added: set[tuple[str, str]]):
+    for model, targets in PARSED_COUNTS.items():
+        targets = {
+            target: source
+            for target, source in targets.items()
+            if (model.__tablename__, target) in added
+        }
+        if not targets:
+            continue
+
+        logger.info("Filling %s.%s", model.__tablename__, ", ".join(targets))
+        sources = [getattr(model, source) for source in targets.values()]
+        last_id = None
+        while True:
+            statement = select(model.id, *sources).order_by(model.id)
+            if last_id is not None:
+                statement = statement.where(model.id > last_id)
+            rows = (await session.exec(statement.limit(CHUNK_SIZE))).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            await session.exec(
+                update(model),
+                params=[
+                    {
+                        "id": row[0],
+                        **{
+                            target: parse_count(value)
+                            for target, value in zip(targets, row[1:])
+                        },
+                    }
+                    for row in rows
+                ],
+            )
+
+
+def _legacy_references(inline) -> list[ReferenceCreate]:
+    references = []
+    for reference in inline or []:
+        try:
+            references.append(ReferenceCreate.model_validate(reference))
+        except ValueError:
+            continue
+    return references
+
+
+async def copy_legacy_papers(conn: AsyncConnection, session: AsyncSession):
+    """
+    Copy the rows of the first paper table into publications and paper.
+
+    A paper joins the publication with its link, or gets a new one. Papers
+    repeating a link already copied are dropped, as save_paper would refuse
+    them. The legacy table is dropped at the end.
+    """
+    if not await conn.run_sync(lambda c: inspect(c).has_table(LEGACY_PAPER_TABLE)):
+        return
+
+    logger.info("Copying papers from %s", LEGACY_PAPER_TABLE)
+    legacy = await conn.run_sync(
+        lambda c: Table(LEGACY_PAPER_TABLE, MetaData(), autoload_with=c)
+    )
+    copied, skipped, last_id = 0, 0, None
+    while True:
+        statement = select(legacy).order_by(legacy.c.id)
+        if last_id is not None:
+            statement = statement.where(legacy.c.id > last_id)
+        rows = (await conn.execute(statement.limit(CHUNK_SIZE))).mappings().all()
+        if not rows:
+            break
+        last_id = rows[-1]["id"]
+
+        result = await session.exec(
+            select(Publications.link, Publications.id, Paper.id)
+            .join(Paper, Paper.id == Publications.id, isouter=True)
+            .where(Publications.link.in_({row["link"] for row in rows}))
+        )
+        existing = {link: (pub_id, paper_id) for link, pub_id, paper_id in result}
+
+        pub_inserts, paper_inserts, references = [], [], {}
+        for row in rows:
+            pub_id, paper_id = existing.get(row["link"], (None, None))
+            if paper_id is not None:
+                skipped += 1
+                continue
+
+            if pub_id is None:
+                try:
+                    pub_date = parse_date(row["pub_date"])
+                except ValueError:
+                    pub_date = date.min
+                pub_id = uuid.uuid4()
+                pub_inserts.append(
+                    {
+                        "id": pub_id,
+                        "title": row["title"],
+                        "link": row["link"],
+                        "types": ["paper"],
+                        "pub_date": pub_date,
+                        "pub_date_str": row["pub_date"],
+                    }
+                )
+            existing[row["link"]] = (pub_id, pub_id)
+
+            references[pub_id] = _legacy_references(row.get("references"))
+            paper_inserts.append(
+                {
+                    "id": pub_id,
+                    "abstract": row["abstract"],
+                    "citation_count": row["citation_count"],
+                    "read_count": row["read_count"],
+                    # Bulk inserts skip the ORM events that fill these
+                    "citation_count_num": parse_count(row["citation_count"]),
+                    "read_count_num": parse_count(row["read_count"]),
+                    "authors": row["authors"] or [],
+                    "reference_count": len(references[pub_id]),
+                }
+            )
+
+        if pub_inserts:
+            await session.exec(insert(Publications), params=pub_inserts)
+        if paper_inserts:
+            await session.exec(insert(Paper), params=paper_inserts)
+            await store_references(session, references)
+        copied += len(paper_inserts)
+
+    await conn.execute(text(f"DROP TABLE {LEGACY_PAPER_TABLE}"))
+    logger.info("Copied %d papers, skipped %d repeated links", copied, skipped)
+
+
+async def migrate(conn: AsyncConnection):
+    """
+    Bring tables made by an older init_db up to the current models.
+
+    Runs inside init_db's transaction, after create_all and before the
+    indexes are created, since those may cover the columns added here.
+    """
+    added = await conn.run_sync(add_missing_columns)
+    for table, column in sorted(added):
+        logger.info("Added column %s.%s", table, column)
+
+    session = AsyncSession(bind=conn)
+    await backfill_parsed_counts(session, added)
+    await copy_legacy_papers(conn, session)
+    await migrate_inline_references(conn)
+
+    # The public routes only read statistics, so fill them once here
+    if (await session.exec(select(Statistic).limit(1))).first() is None:
+        await refresh_statistics(session)
+        await session.flush()
@@ -0,0 +1,4 @@
+from app.factory import create_app
+
+# Public read-only application: uvicorn app.public:app
+app = create_app(admin=False)
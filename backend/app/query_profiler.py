@@ -0,0 +1,137 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Slow statements kept per request, the count of slow ones is not capped
+MAX_SLOW_QUERIES = 10
+
+# Collapses "IN ($1, $2, $3)" and friends so batch sizes share one shape
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\$\d+|\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s|:\w+))*\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so repeats with other parameters compare equal"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryProfile:
+    """Queries run while handling one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.slow_count = 0
+        self.slow: list[tuple[float, str]] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.db_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+        if duration * 1000 >= Config.QUERY_PROFILE_SLOW_MS:
+            self.slow_count += 1
+            if len(self.slow) < MAX_SLOW_QUERIES:
+                self.slow.append((duration, statement))
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run more than threshold times, the N+1 suspects"""
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.1f};desc="{self.count} queries"'
+
+
+current_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "current_profile", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is not None and conn.info.get("query_start"):
+        profile.record(statement, time.perf_counter() - conn.info["query_start"].pop())
+
+
+def install_query_profiler(engine: Engine):
+    """Attach the cursor hooks; they do nothing outside a profiled request"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report(method: str, path: str, profile: QueryProfile):
+    repeated = profile.repeated(Config.QUERY_PROFILE_REPEAT_THRESHOLD)
+    for shape, count in repeated:
+        logger.warning(
+            "Possible N+1 in %s %s: %dx %s", method, path, count, shape[:300]
+        )
+    for duration, statement in profile.slow:
+        logger.warning(
+            "Slow query in %s %s (%.1f ms): %s",
+            method,
+            path,
+            duration * 1000,
+            _WHITESPACE.sub(" ", statement),
+        )
+
+
+class QueryProfilerMiddleware:
+    """
+    Profile a sample of requests, controlled by QUERY_PROFILE_SAMPLE_RATE.
+
+    Sampled responses carry a Server-Timing header with the DB time and
+    query count, and N+1 suspects and slow queries are reported once the
+    request finishes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or random.random() >= Config.QUERY_PROFILE_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        scope.setdefault("state", {})["query_profile"] = profile
+        token = current_profile.set(profile)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", profile.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            report(scope["method"], scope["path"], profile)
@@ -0,0 +1,112 @@
+import gzip
+import hashlib
+import json
+from typing import Any, Awaitable, Callable
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+from app.cache import etag_matches, public_cache_control, response_cache
+from app.config import Config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def _orjson_default(value: Any):
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a response value to JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=_orjson_default)
+    return json.dumps(jsonable_encoder(value), separators=(",", ":")).encode()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip, honouring q-values.
+
+    An explicit gzip entry decides; otherwise a "*" entry does. q=0 means
+    not acceptable.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+class Snapshot:
+    """
+    A public response rendered once to JSON bytes, plus a gzip variant.
+
+    The ETag is a hash of the body, so every worker and every restart
+    hands out the same tag for the same data.
+    """
+
+    __slots__ = ("body", "gzip_body", "etag")
+
+    def __init__(self, value: Any):
+        self.body = dumps(value)
+        self.etag = f'W/"{hashlib.blake2b(self.body, digest_size=16).hexdigest()}"'
+        self.gzip_body = None
+        if Config.SNAPSHOT_GZIP and len(self.body) >= Config.SNAPSHOT_GZIP_MIN_SIZE:
+            self.gzip_body = gzip.compress(self.body, compresslevel=6)
+
+    def response(self, request: Request) -> Response:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": public_cache_control(),
+            "Vary": "Accept-Encoding",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+
+        accept_encoding = request.headers.get("accept-encoding", "")
+        if self.gzip_body is not None and accepts_gzip(accept_encoding):
+            headers["Content-Encoding"] = "gzip"
+            body = self.gzip_body
+        else:
+            body = self.body
+
+        return Response(body, media_type="application/json", headers=headers)
+
+
+async def snapshot_response(
+    request: Request, key: tuple[str, str], loader: Callable[[], Awaitable[Any]]
+) -> Response:
+    """
+    Serve the snapshot cached under key, building it with loader on a miss.
+
+    A snapshot is rendered once after each admin write to its family and
+    then served as-is, with no per-request serialization. A client already
+    holding it gets 304 Not Modified; on a cached snapshot that costs no
+    query.
+    """
+
+    async def build():
+        return Snapshot(await loader())
+
+    snapshot = await response_cache.get_or_load(key, build)
+    return snapshot.response(request)
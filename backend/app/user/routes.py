@@ -1,18 +1,51 @@
+import asyncio
+import logging
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response
 from starlette import status
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.db import get_session
+from app.cache import (
+    HOME,
+    NEWS,
+    PROFILE,
+    PUBLICATIONS,
+    STATISTICS,
+)
+from app.config import Config
+from app.db import get_session, get_session_factory
+from app.media import (
+    CONTENT_TYPES,
+    MEDIA_NAME,
+    Image,
+    MediaError,
+    get_variant,
+    media_cache,
+    variant_width,
+)
+from app.snapshots import snapshot_response
+from app.admin.metrics_refresh import SKIP_VIEW_HEADER, record_view
 from app.admin.models import News, Publications, Profile, Paper
+from app.admin.references import REFERENCES_PAGE_SIZE, get_references
+from app.admin.schemas import PaperDetail, ReferencePage, Statistics
+from app.admin.statistics import get_statistics
+from app.admin.utils import paper_detail
+
+logger = logging.getLogger(__name__)
 
 user_router = APIRouter()
 
 
 @user_router.get("/get_profile")
-async def get_profile_by_id(session: AsyncSession = Depends(get_session)):
-    try:
+async def get_profile_by_id(
+    request: Request, session: AsyncSession = Depends(get_session)
+):
+
+    async def load():
         result = await session.exec(select(Profile))
         profile = result.first()
 
@@ -21,8 +54,73 @@ async def get_profile_by_id(session: AsyncSession = Depends(get_session)):
                 status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
             )
         return profile
-    except Exception as e:
-        print(f"Error getting profile: {e}")
+
+    try:
+        return await snapshot_response(request, (PROFILE, "profile"), load)
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error getting profile")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@user_router.get("/home")
+async def get_home(
+    request: Request,
+    publications: int = Query(6, ge=1, le=50),
+    news: int = Query(6, ge=1, le=50),
+    session_factory=Depends(get_session_factory),
+):
+    """
+    Everything the landing page shows, in one response.
+
+    The profile, the latest publications, the latest and the featured news
+    and the summary counts are queried concurrently, each on its own
+    session, and cached together until any of them changes.
+    """
+
+    async def query(statement):
+        async with session_factory() as session:
+            return (await session.exec(statement)).all()
+
+    async def totals():
+        async with session_factory() as session:
+            return (await get_statistics(session)).totals
+
+    async def load():
+        profiles, latest, latest_news, featured, counts = await asyncio.gather(
+            query(select(Profile).limit(1)),
+            query(
+                select(Publications)
+                .order_by(Publications.pub_date.desc())
+                .limit(publications)
+            ),
+            query(select(News).order_by(News.publish_date.desc()).limit(news)),
+            query(
+                select(News)
+                .where(News.is_featured == True)  # noqa: E712
+                .order_by(News.publish_date.desc())
+                .limit(news)
+            ),
+            totals(),
+        )
+        return {
+            "profile": profiles[0] if profiles else None,
+            "publications": latest,
+            "latest_news": latest_news,
+            "featured_news": featured,
+            "totals": counts,
+        }
+
+    try:
+        return await snapshot_response(
+            request, (HOME, f"home:{publications}:{news}"), load
+        )
+    except Exception:
+        logger.exception("Error fetching home")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -30,7 +128,9 @@ async def get_profile_by_id(session: AsyncSession = Depends(get_session)):
 
 
 @user_router.get("/get_all_research")
-async def get_all_research(session: AsyncSession = Depends(get_session)):
+async def get_all_research(
+    request: Request, session: AsyncSession = Depends(get_session)
+):
     """
     Retrieve all research publications from the database.
 
@@ -40,7 +140,8 @@ async def get_all_research(session: AsyncSession = Depends(get_session)):
     Returns:
         list: List of all Publication objects from the database.
     """
-    try:
+
+    async def load():
         statement = select(Publications).order_by(Publications.pub_date.desc())
         result = await session.exec(statement)
         publications = result.all()
@@ -51,65 +152,261 @@ async def get_all_research(session: AsyncSession = Depends(get_session)):
             )
 
         return publications
-    except Exception as e:
-        print(f"Error fetching publications: {e}")
+
+    try:
+        return await snapshot_response(request, (PUBLICATIONS, "all"), load)
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching publications")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         )
 
 
-@user_router.get("/paper/{paper_id}")
+@user_router.get("/paper/{paper_id}", response_model=PaperDetail)
 async def get_paper_by_id(
-    paper_id: uuid.UUID, session: AsyncSession = Depends(get_session)
+    paper_id: uuid.UUID,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Retrieve a research publication by its ID.
 
     Args:
-        paper_id (int): Publication ID.
+        paper_id (uuid.UUID): Paper ID, shared with its Publication.
         session (AsyncSession): Database session dependency.
 
     Returns:
-        Publication: Publication object.
+        PaperDetail: Paper details joined with its Publication.
     """
-    try:
-        statement = select(Paper).where(Paper.id == paper_id)
-        result = await session.exec(statement)
-        paper = result.first()
 
-        statement = select(Publications).where(Publications.id == paper.id)
+    async def load():
+        statement = (
+            select(Paper, Publications)
+            .join(Publications, Paper.id == Publications.id)
+            .where(Paper.id == paper_id)
+        )
         result = await session.exec(statement)
-        publication = result.first()
+        row = result.first()
 
-        if not paper or not publication:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found"
             )
 
-        combined = {**paper.__dict__, **publication.__dict__}
-        return combined
+        paper, publication = row
+        return paper_detail(paper, publication)
 
-    except Exception as e:
-        print(f"Error fetching publication: {e}")
+    try:
+        response = await snapshot_response(
+            request, (PUBLICATIONS, f"paper:{paper_id}"), load
+        )
+        if response.status_code == 200 and SKIP_VIEW_HEADER not in request.headers:
+            record_view(paper_id)
+        return response
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching publication")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         )
 
 
-@user_router.get("/news", response_model=list[News])
-async def get_all_news(session: AsyncSession = Depends(get_session)):
+async def references_page(
+    request: Request,
+    paper_id: uuid.UUID,
+    offset: int,
+    limit: int,
+    session: AsyncSession,
+):
+    """One page of a paper's references, as a cached snapshot"""
+
+    async def load():
+        result = await session.exec(
+            select(Paper.reference_count).where(Paper.id == paper_id)
+        )
+        total = result.first()
+
+        if total is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Paper not found"
+            )
+
+        references = await get_references(session, paper_id, offset, limit)
+        return ReferencePage(
+            total=total, offset=offset, limit=limit, references=references
+        )
+
+    try:
+        return await snapshot_response(
+            request, (PUBLICATIONS, f"references:{paper_id}:{offset}:{limit}"), load
+        )
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Error fetching references")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@user_router.get("/paper/{paper_id}/references", response_model=ReferencePage)
+async def get_paper_references(
+    paper_id: uuid.UUID,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(REFERENCES_PAGE_SIZE, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
     """
-    Get all news items, ordered by publish date descending.
+    Retrieve one page of a paper's references.
+
+    The paper detail only carries reference_count; the references are
+    loaded separately, when the reader asks for them.
+    """
+    return await references_page(request, paper_id, offset, limit, session)
+
+
+@user_router.get("/paper/{paper_id}/references/{offset}", response_model=ReferencePage)
+async def get_paper_references_from(
+    paper_id: uuid.UUID,
+    request: Request,
+    offset: int = Path(ge=0),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Retrieve the default-sized page of references starting at offset.
+
+    Same as ?offset=, but addressed by path alone, so the static export can
+    serve every page as a plain file.
+    """
+    return await references_page(
+        request, paper_id, offset, REFERENCES_PAGE_SIZE, session
+    )
+
+
+async def get_top_papers(metric, limit: int, session: AsyncSession):
+    """Rank papers by a numeric metric column in the database"""
+    statement = (
+        select(Paper, Publications)
+        .join(Publications, Paper.id == Publications.id)
+        .where(metric.is_not(None))
+        .order_by(metric.desc())
+        .limit(limit)
+    )
+    result = await session.exec(statement)
+    return [paper_detail(paper, publication) for paper, publication in result.all()]
+
+
+@user_router.get("/most_cited", response_model=list[PaperDetail])
+async def get_most_cited(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get the most cited papers, ordered by citation count descending.
+    """
+    try:
+        return await snapshot_response(
+            request,
+            (PUBLICATIONS, f"most_cited:{limit}"),
+            lambda: get_top_papers(Paper.citation_count_num, limit, session),
+        )
+    except Exception:
+        logger.exception("Error fetching most cited papers")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@user_router.get("/most_read", response_model=list[PaperDetail])
+async def get_most_read(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get the most read papers, ordered by read count descending.
     """
     try:
-        statement = select(News).order_by(News.publish_date.desc())
+        return await snapshot_response(
+            request,
+            (PUBLICATIONS, f"most_read:{limit}"),
+            lambda: get_top_papers(Paper.read_count_num, limit, session),
+        )
+    except Exception:
+        logger.exception("Error fetching most read papers")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@user_router.get("/statistics", response_model=Statistics)
+async def get_publication_statistics(
+    request: Request, session: AsyncSession = Depends(get_session)
+):
+    """
+    Get precomputed publication and news statistics.
+
+    The summary is maintained by the admin write routes, so this only reads
+    a handful of rows regardless of the catalog size.
+    """
+    try:
+        return await snapshot_response(
+            request, (STATISTICS, "all"), lambda: get_statistics(session)
+        )
+    except Exception:
+        logger.exception("Error fetching statistics")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+
+@user_router.get("/news", response_model=list[News])
+async def get_all_news(
+    request: Request,
+    featured: bool | None = None,
+    news_type: str | None = Query(None, alias="type"),
+    since: date | None = None,
+    until: date | None = None,
+    limit: int | None = Query(None, ge=1, le=100),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get news items, ordered by publish date descending.
+
+    Optionally only featured (or non-featured) items, one news type, a
+    publish date window and at most limit items.
+    """
+
+    async def load():
+        statement = select(News)
+        if featured is not None:
+            statement = statement.where(News.is_featured == featured)
+        if news_type:
+            statement = statement.where(News.news_type == news_type)
+        if since:
+            statement = statement.where(News.publish_date >= since)
+        if until:
+            statement = statement.where(News.publish_date <= until)
+        statement = statement.order_by(News.publish_date.desc()).limit(limit)
         result = await session.exec(statement)
-        news = result.all()
-        return news
-    except Exception as e:
-        print(f"Error fetching news: {e}")
+        return result.all()
+
+    key = f"list:{featured}:{news_type}:{since}:{until}:{limit}"
+    try:
+        return await snapshot_response(request, (NEWS, key), load)
+    except Exception:
+        logger.exception("Error fetching news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
@@ -117,22 +414,106 @@ async def get_all_news(session: AsyncSession = Depends(get_session)):
 
 
 @user_router.get("/news/{news_id}", response_model=News)
-async def get_news_by_id(news_id: str, session: AsyncSession = Depends(get_session)):
+async def get_news_by_id(
+    news_id: str, request: Request, session: AsyncSession = Depends(get_session)
+):
     """
     Get a specific news item by ID.
     """
-    try:
+
+    async def load():
         news = await session.get(News, news_id)
         if not news:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="News not found"
             )
         return news
+
+    try:
+        return await snapshot_response(request, (NEWS, f"news:{news_id}"), load)
     except HTTPException:
         raise
-    except Exception as e:
-        print(f"Error fetching news: {e}")
+    except Exception:
+        logger.exception("Error fetching news")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         )
+
+
+@user_router.get("/media")
+async def get_media(
+    request: Request,
+    src: str,
+    w: int = Query(256, ge=1, le=4096),
+    format: Literal["auto", "webp", "original"] = "auto",
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Redirect to a cached, resized copy of the profile picture or a news image.
+
+    The copy is fetched and resized once; its URL carries a hash of its
+    content, so it can be cached by browsers forever. With format=auto
+    WebP is served to browsers that accept it.
+    """
+    fmt = format
+    if Image is None:
+        fmt = "original"
+    elif fmt == "auto":
+        accepts_webp = "image/webp" in request.headers.get("accept", "")
+        fmt = "webp" if Config.MEDIA_WEBP and accepts_webp else "original"
+
+    try:
+        name = await get_variant(src, variant_width(w), fmt, session)
+    except MediaError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception:
+        logger.exception("Error fetching media")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        )
+
+    # src and w are kept so an evicted copy can be rebuilt from its URL
+    url = request.url_for("get_media_file", name=name).include_query_params(
+        src=src, w=w, format=format
+    )
+    return RedirectResponse(
+        str(url),
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={
+            "Cache-Control": f"public, max-age={Config.MEDIA_REDIRECT_MAX_AGE}",
+            "Vary": "Accept",
+        },
+    )
+
+
+@user_router.get("/media/{name}")
+async def get_media_file(name: str, request: Request, src: str | None = None):
+    """
+    Serve a cached image copy by its content-hashed name.
+    """
+    if not MEDIA_NAME.match(name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    if not media_cache.touch(name):
+        if src is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Not found"
+            )
+        url = request.url_for("get_media").include_query_params(**request.query_params)
+        return RedirectResponse(
+            str(url),
+            status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    etag = f'"{name.split(".")[0]}"'
+    headers = {"Cache-Control": "public, max-age=31536000, immutable", "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return FileResponse(
+        media_cache.path(name),
+        media_type=CONTENT_TYPES[name.rsplit(".", 1)[1]],
+        headers=headers,
+    )
@@ -0,0 +1,233 @@
+"""
+Load test of the public /user endpoints.
+
+Runs concurrent clients against a running server for a fixed duration,
+spread over a weighted mix of endpoints, and reports throughput and
+latency percentiles per endpoint. When the server runs with
+QUERY_PROFILE_ENABLED, the DB time and query count from its Server-Timing
+header are reported too. Seed the database first with benchmarks.seed.
+
+    python -m benchmarks.load_test --base-url http://localhost:8000 \\
+        --concurrency 32 --duration 30 --out results/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from sqlmodel import select
+
+from app.admin.models import News, Paper
+from app.db import engine
+from benchmarks.login_throughput import percentiles
+
+# name: (path, weight); {paper_id} and {news_id} are filled per request
+ENDPOINTS = {
+    "home": ("/user/home", 10),
+    "profile": ("/user/get_profile", 10),
+    "research": ("/user/get_all_research", 2),
+    "paper": ("/user/paper/{paper_id}", 30),
+    "references": ("/user/paper/{paper_id}/references", 5),
+    "most_cited": ("/user/most_cited", 10),
+    "most_read": ("/user/most_read", 10),
+    "statistics": ("/user/statistics", 10),
+    "news": ("/user/news", 20),
+    "news_item": ("/user/news/{news_id}", 8),
+}
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+async def sample_ids(count: int) -> dict[str, list[str]]:
+    """Pick paper and news ids straight from the database the server uses"""
+    async with engine.connect() as conn:
+        papers = await conn.execute(select(Paper.id).limit(count))
+        news = await conn.execute(select(News.id).limit(count))
+        return {
+            "paper_id": [str(row[0]) for row in papers],
+            "news_id": [str(row[0]) for row in news],
+        }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.db_times = defaultdict(list)
+        self.queries = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.bytes = defaultdict(int)
+
+    def record(self, name: str, response: httpx.Response | None, latency: float):
+        status = str(response.status_code) if response is not None else "error"
+        self.statuses[name][status] += 1
+        self.latencies[name].append(latency)
+        if response is None:
+            return
+
+        self.bytes[name] += len(response.content)
+        match = _SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+        if match:
+            self.db_times[name].append(float(match.group(1)) / 1000)
+            self.queries[name] += int(match.group(2))
+
+    def summary(self, name: str, seconds: float) -> dict:
+        count = len(self.latencies[name])
+        result = {
+            "requests": count,
+            "per_second": count / seconds,
+            "statuses": dict(self.statuses[name]),
+            "bytes_per_request": self.bytes[name] / count if count else 0,
+            "latency": percentiles(self.latencies[name]),
+        }
+        if self.db_times[name]:
+            result["db_time"] = percentiles(self.db_times[name])
+            result["queries_per_request"] = self.queries[name] / len(
+                self.db_times[name]
+            )
+        return result
+
+
+async def client_worker(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    mix: list[tuple[str, str]],
+    weights: list[int],
+    ids: dict[str, list[str]],
+    deadline: float,
+    rng: random.Random,
+):
+    while time.perf_counter() < deadline:
+        name, path = rng.choices(mix, weights)[0]
+        url = path.format(**{key: rng.choice(ids[key]) for key in ids if ids[key]})
+        started = time.perf_counter()
+        try:
+            response = await client.get(url)
+        except httpx.HTTPError:
+            response = None
+        recorder.record(name, response, time.perf_counter() - started)
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args) -> dict:
+    names = args.endpoints or list(ENDPOINTS)
+    ids = await sample_ids(args.sample_ids)
+    if not ids["paper_id"]:
+        names = [name for name in names if "{paper_id}" not in ENDPOINTS[name][0]]
+    if not ids["news_id"]:
+        names = [name for name in names if "{news_id}" not in ENDPOINTS[name][0]]
+    mix = [(name, ENDPOINTS[name][0]) for name in names]
+    weights = [ENDPOINTS[name][1] for name in names]
+
+    headers = {"Accept-Encoding": "gzip"} if args.gzip else {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60, headers=headers
+    ) as client:
+        dataset = (await client.get("/user/statistics")).json().get("totals", {})
+
+        # Warm caches and connection pools before measuring
+        warm_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(
+            *[
+                client_worker(
+                    client,
+                    Recorder(),
+                    mix,
+                    weights,
+                    ids,
+                    warm_deadline,
+                    random.Random(i),
+                )
+                for i in range(args.concurrency)
+            ]
+        )
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *[
+                client_worker(
+                    client,
+                    recorder,
+                    mix,
+                    weights,
+                    ids,
+                    deadline,
+                    random.Random(args.seed + i),
+                )
+                for i in range(args.concurrency)
+            ]
+        )
+        seconds = time.perf_counter() - started
+
+    all_latencies = [value for name in names for value in recorder.latencies[name]]
+    all_db_times = [value for name in names for value in recorder.db_times[name]]
+    errors = sum(
+        count
+        for name in names
+        for status, count in recorder.statuses[name].items()
+        if not status.startswith("2")
+    )
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "gzip": args.gzip,
+            "dataset": dataset,
+        },
+        "overall": {
+            "requests": len(all_latencies),
+            "errors": errors,
+            "per_second": len(all_latencies) / seconds,
+            "latency": percentiles(all_latencies),
+            "db_time": percentiles(all_db_times),
+        },
+        "endpoints": {name: recorder.summary(name, seconds) for name in names},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument(
+        "--endpoints", nargs="+", choices=list(ENDPOINTS), help="Defaults to all"
+    )
+    parser.add_argument("--sample-ids", type=int, default=1000)
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    print(output)
@@ -0,0 +1,135 @@
+"""
+Login throughput benchmark.
+
+Measures public endpoint latency against a running server, first on its
+own and then while a stream of concurrent logins runs, and reports login
+throughput. With bcrypt off the event loop the public latency should stay
+flat in the second phase.
+
+Successful logins give their throttle tokens back, so the default
+concurrency, below LOGIN_BURST, runs against the default config. Throttled
+logins wait for Retry-After and are counted; start the server with
+LOGIN_THROTTLE_ENABLED=false to measure higher concurrency unthrottled.
+
+    python -m benchmarks.login_throughput --base-url http://localhost:8000 \\
+        --username admin --password admin123
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pick(0.50) * 1000,
+        "p95_ms": pick(0.95) * 1000,
+        "p99_ms": pick(0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+async def probe_public(
+    client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float
+) -> list[float]:
+    """Request path at a steady pace until stop is set, recording latencies"""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def login_worker(
+    client: httpx.AsyncClient, username: str, password: str, count: int
+) -> tuple[int, int]:
+    """Log in count times, returning the logins and the throttled attempts"""
+    done = throttled = 0
+    while done < count:
+        response = await client.post(
+            "/admin/login", data={"username": username, "password": password}
+        )
+        if response.status_code == 429:
+            throttled += 1
+            await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+            continue
+        response.raise_for_status()
+        done += 1
+    return done, throttled
+
+
+async def run(args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=60
+    ) as client:
+        # Warm the public response cache before measuring
+        await client.get(args.public_path)
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(
+            probe_public(client, args.public_path, stop, args.interval)
+        )
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await probe
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(
+            probe_public(client, args.public_path, stop, args.interval)
+        )
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[
+                login_worker(client, args.username, args.password, args.logins)
+                for _ in range(args.concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        under_load = await probe
+
+    logins = sum(done for done, _ in results)
+    return {
+        "public_path": args.public_path,
+        "baseline": percentiles(baseline),
+        "during_logins": percentiles(under_load),
+        "logins": {
+            "total": logins,
+            "throttled": sum(throttled for _, throttled in results),
+            "concurrency": args.concurrency,
+            "seconds": elapsed,
+            "per_second": logins / elapsed,
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--public-path", default="/user/get_profile")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=10, help="Logins per worker")
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
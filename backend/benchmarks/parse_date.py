@@ -0,0 +1,108 @@
+"""
+Micro-benchmark for app.admin.utils.parse_date.
+
+Compares the tiered parser (format fast paths, memo, dateutil fallback)
+with plain dateutil fuzzy parsing on a sample of scraped-style dates.
+
+    python -m benchmarks.parse_date --count 100000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from dateutil.parser import parse
+
+from app.admin.utils import _parse_date_on, parse_date, parse_dates
+
+SAMPLE_FORMATS = [
+    "{month_abbr} {year}",
+    "{month_name} {year}",
+    "{year}-{month:02d}-{day:02d}",
+    "{month_abbr} {day}, {year}",
+    "{day} {month_name} {year}",
+    "Article · {month_abbr} {year}",
+]
+MONTHS = [
+    ("Jan", "January"),
+    ("Feb", "February"),
+    ("Mar", "March"),
+    ("Apr", "April"),
+    ("May", "May"),
+    ("Jun", "June"),
+    ("Jul", "July"),
+    ("Aug", "August"),
+    ("Sep", "September"),
+    ("Oct", "October"),
+    ("Nov", "November"),
+    ("Dec", "December"),
+]
+
+
+def sample_dates(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        month = rng.randint(1, 12)
+        samples.append(
+            rng.choice(SAMPLE_FORMATS).format(
+                month=month,
+                month_abbr=MONTHS[month - 1][0],
+                month_name=MONTHS[month - 1][1],
+                day=rng.randint(1, 28),
+                year=rng.randint(2000, 2025),
+            )
+        )
+    return samples
+
+
+def dateutil_parse_date(date_str: str):
+    """The previous implementation of parse_date"""
+    return parse(date_str, fuzzy=True).date()
+
+
+def timed(fn, date_strs: list[str]) -> float:
+    started = time.perf_counter()
+    fn(date_strs)
+    return time.perf_counter() - started
+
+
+def run(count: int) -> dict:
+    date_strs = sample_dates(count)
+
+    mismatches = [s for s in date_strs if parse_date(s) != dateutil_parse_date(s)]
+
+    results = {}
+    results["dateutil"] = timed(
+        lambda items: [dateutil_parse_date(s) for s in items], date_strs
+    )
+    _parse_date_on.cache_clear()
+    results["tiered_cold"] = timed(
+        lambda items: [parse_date(s) for s in items], date_strs
+    )
+    results["tiered_warm"] = timed(
+        lambda items: [parse_date(s) for s in items], date_strs
+    )
+    _parse_date_on.cache_clear()
+    results["parse_dates_cold"] = timed(parse_dates, date_strs)
+
+    return {
+        "count": count,
+        "distinct": len(set(date_strs)),
+        "mismatches": mismatches[:10],
+        "seconds": results,
+        "speedup_vs_dateutil": {
+            name: results["dateutil"] / seconds
+            for name, seconds in results.items()
+            if name != "dateutil"
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.count), indent=2))
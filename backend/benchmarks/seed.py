@@ -0,0 +1,234 @@
+"""
+Seed the configured database with a synthetic dataset.
+
+Writes one profile plus publications, papers with references and news at
+the requested scale, using bulk inserts. The same --seed always produces
+the same rows, so runs on different branches compare like for like.
+
+    python -m benchmarks.seed --scale 100k --reset
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.admin.models import (
+    News,
+    Paper,
+    PaperReference,
+    Profile,
+    Publications,
+    Reference as ReferenceRow,
+    Statistic,
+)
+from app.admin.references import store_references
+from app.admin.schemas import Reference
+from app.admin.statistics import refresh_statistics
+from app.admin.utils import parse_count
+from app.db import engine, init_db
+
+WORDS = (
+    "adaptive analysis approach bayesian channel deep detection distributed "
+    "efficient estimation framework graph hybrid learning model network "
+    "optimization power quantum robust scalable sensor signal sparse "
+    "spectrum system transformer uncertainty wireless"
+).split()
+PUB_TYPES = ["Article", "Conference Paper", "Preprint", "Chapter", "Thesis"]
+NEWS_TYPES = ["announcement", "upcoming_paper", "project", "event"]
+
+CHUNK_SIZE = 5000
+
+
+def make_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def random_date(rng: random.Random) -> date:
+    return date(2000, 1, 1) + timedelta(days=rng.randrange(9000))
+
+
+def publication_rows(rng: random.Random, count: int, paper_ratio: float, refs: int):
+    """Yield (publication, paper or None, references) rows"""
+    for i in range(count):
+        pub_date = random_date(rng)
+        publication = {
+            "id": make_uuid(rng),
+            "title": sentence(rng, rng.randint(5, 14)),
+            "link": f"https://example.org/publication/{i}",
+            "types": [rng.choice(PUB_TYPES)],
+            "pub_date": pub_date,
+            "pub_date_str": pub_date.strftime("%b %Y"),
+        }
+        paper, references = None, []
+        if rng.random() < paper_ratio:
+            citations = str(int(rng.paretovariate(1.2)) - 1)
+            reads = str(int(rng.paretovariate(0.8) * 10))
+            paper = {
+                "id": publication["id"],
+                "abstract": sentence(rng, rng.randint(80, 200)),
+                "citation_count": citations,
+                "read_count": reads,
+                # Bulk inserts skip the ORM events that fill these
+                "citation_count_num": parse_count(citations),
+                "read_count_num": parse_count(reads),
+                "authors": [sentence(rng, 2) for _ in range(rng.randint(1, 8))],
+            }
+            # Links repeat across papers, like popular citations do
+            references = [
+                Reference(
+                    title=sentence(rng, rng.randint(5, 12)),
+                    link=f"https://example.org/reference/{rng.randrange(count * 5)}",
+                    authors=[sentence(rng, 2) for _ in range(rng.randint(1, 5))],
+                )
+                for _ in range(rng.randint(0, refs))
+            ]
+            paper["reference_count"] = len(references)
+        yield publication, paper, references
+
+
+def news_rows(rng: random.Random, count: int):
+    for _ in range(count):
+        publish_date = random_date(rng)
+        yield {
+            "id": make_uuid(rng),
+            "title": sentence(rng, rng.randint(4, 10)),
+            "content": sentence(rng, rng.randint(30, 120)),
+            "image_url": None,
+            "publish_date": publish_date,
+            "publish_date_str": publish_date.strftime("%b %d, %Y"),
+            "news_type": rng.choice(NEWS_TYPES),
+            "is_featured": rng.random() < 0.05,
+        }
+
+
+def profile_row(publications: int) -> dict:
+    total_pub, reads, total_citations = str(publications), "12.4k", "3,210"
+    return {
+        "name": "Benchmark Researcher",
+        "profile_pic": "https://example.org/profile.png",
+        "total_pub": total_pub,
+        "reads": reads,
+        "total_citations": total_citations,
+        # Bulk inserts skip the ORM events that fill these
+        "total_pub_num": parse_count(total_pub),
+        "reads_num": parse_count(reads),
+        "total_citations_num": parse_count(total_citations),
+        "institution": "Example University",
+        "department": "Computer Science",
+        "address": "Example City",
+        "position": "Professor",
+        "skills": ["Signal Processing", "Machine Learning"],
+    }
+
+
+async def insert_chunks(session: AsyncSession, model, rows, chunk_size: int) -> int:
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            await session.exec(insert(model), params=chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        await session.exec(insert(model), params=chunk)
+        total += len(chunk)
+    return total
+
+
+async def write_chunk(
+    session: AsyncSession,
+    publications: list[dict],
+    papers: list[dict],
+    references: dict[uuid.UUID, list[Reference]],
+):
+    if publications:
+        await session.exec(insert(Publications), params=publications)
+    if papers:
+        await session.exec(insert(Paper), params=papers)
+        await store_references(session, references)
+
+
+async def seed(args) -> dict:
+    await init_db()
+    rng = random.Random(args.seed)
+    scale = parse_count(args.scale)
+    news_count = args.news if args.news is not None else max(10, scale // 20)
+
+    started = time.perf_counter()
+    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        if args.reset:
+            for model in (
+                PaperReference,
+                ReferenceRow,
+                Paper,
+                Publications,
+                News,
+                Profile,
+                Statistic,
+            ):
+                await session.exec(delete(model))
+        await session.exec(insert(Profile), params=[profile_row(scale)])
+
+        papers = 0
+        pub_chunk, paper_chunk, references = [], [], {}
+        for publication, paper, paper_references in publication_rows(
+            rng, scale, args.paper_ratio, args.max_references
+        ):
+            pub_chunk.append(publication)
+            if paper:
+                paper_chunk.append(paper)
+                references[paper["id"]] = paper_references
+            if len(pub_chunk) >= args.chunk_size:
+                await write_chunk(session, pub_chunk, paper_chunk, references)
+                papers += len(paper_chunk)
+                pub_chunk, paper_chunk, references = [], [], {}
+                await session.commit()
+        await write_chunk(session, pub_chunk, paper_chunk, references)
+        papers += len(paper_chunk)
+
+        news = await insert_chunks(
+            session, News, news_rows(rng, news_count), args.chunk_size
+        )
+        await refresh_statistics(session)
+        await session.commit()
+
+    return {
+        "publications": scale,
+        "papers": papers,
+        "news": news,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--scale", default="10k", help="Publications to create, e.g. 10k, 100k, 1m"
+    )
+    parser.add_argument("--paper-ratio", type=float, default=0.5)
+    parser.add_argument("--max-references", type=int, default=20)
+    parser.add_argument("--news", type=int, help="Defaults to scale / 20")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="Delete all existing publications, papers, news and profiles first",
+    )
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(seed(args)), indent=2))
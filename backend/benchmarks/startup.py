@@ -0,0 +1,66 @@
+"""
+Import time and memory of the application entry points.
+
+Imports each entry point in a fresh interpreter and reports the import
+time, the resident memory afterwards and which heavy dependencies were
+loaded.
+
+    python -m benchmarks.startup --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = ["app.public", "app.main"]
+HEAVY_MODULES = ["playwright", "parsel", "lxml", "passlib", "jose"]
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+with open("/proc/self/status") as f:
+    rss_kb = next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+print(json.dumps({{
+    "import_ms": elapsed * 1000,
+    "rss_mb": rss_kb / 1024,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {
+        "import_ms_median": statistics.median(run["import_ms"] for run in runs),
+        "rss_mb_median": statistics.median(run["rss_mb"] for run in runs),
+        "max_rss_mb_median": statistics.median(run["max_rss_mb"] for run in runs),
+        "heavy_modules": runs[-1]["heavy_modules"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    args = parser.parse_args()
+
+    print(
+        json.dumps(
+            {module: measure(module, args.repeat) for module in args.modules},
+            indent=2,
+        )
+    )
@@ -18,13 +18,12 @@ const HomePage = () => {
     // Fetch data from the API
     const fetchData = async () => {
       try {
-        const [researchResponse, newsResponse] = await Promise.all([
-          axios.get(`${API_URL}/user/get_all_research`),
-          axios.get(`${API_URL}/user/news`),
-        ]);
+        const response = await axios.get(`${API_URL}/user/home`, {
+          params: { publications: 6, news: 6 },
+        });
 
-        setResearchData(researchResponse.data);
-        setNewsData(newsResponse.data);
+        setResearchData(response.data.publications);
+        setNewsData(response.data.latest_news);
       } catch (error) {
         console.error("Error fetching data:", error);
       } finally {
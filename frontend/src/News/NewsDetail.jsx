@@ -1,7 +1,7 @@
 import { useEffect, useState } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import { usePageTitle } from "../hooks/usePageTitle";
-import api from "../utils/api";
+import api, { mediaUrl } from "../utils/api";
 
 const NewsDetail = () => {
   const { id } = useParams();
@@ -97,7 +97,7 @@ const NewsDetail = () => {
             <article>
               {news.image_url && (
                 <img
-                  src={news.image_url}
+                  src={mediaUrl(news.image_url, 1024)}
                   alt={news.title}
                   className="w-full h-64 md:h-96 object-cover mb-6"
                   onError={(e) => {
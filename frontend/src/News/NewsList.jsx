@@ -1,6 +1,6 @@
 import { useState, useEffect } from "react";
 import { Link } from "react-router-dom";
-import api from "../utils/api";
+import api, { mediaUrl } from "../utils/api";
 import { usePageTitle } from "../hooks/usePageTitle";
 
 const NewsList = () => {
@@ -130,7 +130,7 @@ const NewsList = () => {
                     >
                       {item.image_url && (
                         <img
-                          src={item.image_url}
+                          src={mediaUrl(item.image_url, 512)}
                           alt={item.title}
                           className="w-full h-48 object-cover"
                           onError={(e) => {
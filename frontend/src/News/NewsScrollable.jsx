@@ -9,7 +9,9 @@ const Home = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const newsResponse = await api.get("/user/news");
+        const newsResponse = await api.get("/user/news", {
+          params: { limit: 6 },
+        });
         setNewsData(newsResponse.data);
       } catch (error) {
         console.error("Error fetching news data:", error);
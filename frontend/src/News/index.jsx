@@ -2,7 +2,7 @@ import { useState, useEffect } from "react";
 import axios from "axios";
 import { Link } from "react-router-dom";
 
-import { API_URL } from "../utils/api";
+import { API_URL, mediaUrl } from "../utils/api";
 
 const News = () => {
   const [newsData, setNewsData] = useState([]);
@@ -121,7 +121,7 @@ const News = () => {
                     {item.image_url && (
                       <div className="h-48 w-full overflow-hidden">
                         <img
-                          src={item.image_url}
+                          src={mediaUrl(item.image_url, 512)}
                           alt={item.title}
                           className="w-full h-full object-cover"
                         />
@@ -3,7 +3,7 @@ import { useEffect, useState } from "react";
 import axios from "axios";
 import { usePageTitle } from "../hooks/usePageTitle";
 
-import { API_URL } from "../utils/api";
+import { API_URL, mediaUrl } from "../utils/api";
 
 const ProfilePage = () => {
   usePageTitle("Researcher Profile");
@@ -46,7 +46,7 @@ const ProfilePage = () => {
       <div className="max-w-4xl mx-auto bg-white shadow-lg rounded-lg overflow-hidden">
         <div className="flex items-center p-6 bg-gray-100">
           <img
-            src={profile.profile_pic}
+            src={mediaUrl(profile.profile_pic, 192)}
             alt={profile.name}
             className="w-24 h-24 rounded-full border-2 border-gray-300"
           />
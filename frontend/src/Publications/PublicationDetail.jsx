@@ -9,6 +9,8 @@ const PublicationDetail = () => {
   const [publication, setPublication] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const [references, setReferences] = useState([]);
+  const [loadingReferences, setLoadingReferences] = useState(false);
 
   // Handle going back to the previous page
   const handleGoBack = () => {
@@ -28,9 +30,27 @@ const PublicationDetail = () => {
       }
     };
 
+    setReferences([]);
     fetchPublication();
   }, [id]);
 
+  // References are fetched only when asked for, a page at a time. Pages
+  // are addressed by path so the static export can serve them as files.
+  const loadReferences = async () => {
+    setLoadingReferences(true);
+    try {
+      const path = references.length
+        ? `/user/paper/${id}/references/${references.length}`
+        : `/user/paper/${id}/references`;
+      const response = await api.get(path);
+      setReferences([...references, ...response.data.references]);
+    } catch (error) {
+      console.error("Error fetching references:", error);
+    } finally {
+      setLoadingReferences(false);
+    }
+  };
+
   // Dynamic title that updates once data is loaded
   usePageTitle(publication ? publication.title : "Publication Details");
 
@@ -194,21 +214,34 @@ const PublicationDetail = () => {
           </div>
 
           {/* References */}
-          {publication.references && publication.references.length > 0 && (
+          {publication.reference_count > 0 && (
             <div className="mb-6">
               <h2 className="text-lg font-semibold text-gray-800 mb-2">
-                References ({publication.references.length})
+                References ({publication.reference_count})
               </h2>
               <div className="bg-gray-50 p-4 rounded-md">
-                <ol className="list-decimal pl-5">
-                  {publication.references.map((reference, index) => (
-                    <li key={index} className="mb-2 text-sm text-gray-700">
-                      {reference.title ||
-                        reference.text ||
-                        "Untitled reference"}
-                    </li>
-                  ))}
-                </ol>
+                {references.length > 0 && (
+                  <ol className="list-decimal pl-5">
+                    {references.map((reference, index) => (
+                      <li key={index} className="mb-2 text-sm text-gray-700">
+                        {reference.title || "Untitled reference"}
+                      </li>
+                    ))}
+                  </ol>
+                )}
+                {references.length < publication.reference_count && (
+                  <button
+                    onClick={loadReferences}
+                    disabled={loadingReferences}
+                    className="text-blue-600 hover:underline text-sm"
+                  >
+                    {loadingReferences
+                      ? "Loading..."
+                      : references.length > 0
+                      ? "Show more references"
+                      : "Show references"}
+                  </button>
+                )}
               </div>
             </div>
           )}
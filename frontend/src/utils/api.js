@@ -2,6 +2,10 @@ import axios from "axios";
 
 export const API_URL = "https://paper-space.onrender.com";
 
+// Resized, cached copy of a profile or news image, served by the API
+export const mediaUrl = (src, width) =>
+  `${API_URL}/user/media?src=${encodeURIComponent(src)}&w=${width}`;
+
 const api = axios.create({
   baseURL: API_URL,
   headers: {